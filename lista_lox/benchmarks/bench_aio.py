@@ -0,0 +1,83 @@
+"""Many concurrent sleeping scripts: one event loop against a thread per script.
+
+Also reports what the async mode costs on a CPU-bound program.
+
+    python benchmarks/bench_aio.py [scripts] [sleeps per script]
+"""
+import asyncio
+import sys
+import threading
+import time
+from lox.__main__ import Lox
+
+SLEEPER = """
+var total = 0;
+for (var i = 0; i < sleeps; i = i + 1) {
+    sleep(0.05);
+    total = total + i;
+}
+print total;
+"""
+
+CPU_BOUND = """
+fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+print fib(18);
+"""
+
+
+def script(sleeps: int) -> str:
+    return f"var sleeps = {sleeps};" + SLEEPER
+
+
+def with_threads(scripts: int, sleeps: int) -> float:
+    source = script(sleeps)
+    results = []
+
+    def job():
+        results.append(Lox(output=[]).run(source))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=job) for _ in range(scripts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    assert results == [""] * scripts
+    return elapsed
+
+
+def with_event_loop(scripts: int, sleeps: int) -> float:
+    source = script(sleeps)
+
+    async def main():
+        return await asyncio.gather(*(Lox(output=[]).run_async(source) for _ in range(scripts)))
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+    assert results == [""] * scripts
+    return elapsed
+
+
+def cpu_bound() -> tuple[float, float]:
+    start = time.perf_counter()
+    Lox(output=[]).run(CPU_BOUND)
+    sync = time.perf_counter() - start
+    start = time.perf_counter()
+    asyncio.run(Lox(output=[]).run_async(CPU_BOUND))
+    return sync, time.perf_counter() - start
+
+
+def main(scripts: int = 2000, sleeps: int = 10):
+    print(f"{scripts} scripts, {sleeps} sleeps of 50ms each")
+    print(f"{'mode':>12}{'time (s)':>10}{'scripts/s':>11}")
+    for name, runner in (("threads", with_threads), ("event loop", with_event_loop)):
+        elapsed = runner(scripts, sleeps)
+        print(f"{name:>12}{elapsed:>10.2f}{scripts / elapsed:>11.1f}")
+    sync, cooperative = cpu_bound()
+    print(f"fib(18): run {sync:.3f}s, run_async {cooperative:.3f}s ({cooperative / sync:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
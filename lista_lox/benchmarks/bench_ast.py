@@ -0,0 +1,98 @@
+"""Memory and traversal benchmark for the AST.
+
+Compares the slotted node classes in ``lox.ast`` against equivalent plain
+classes that keep a per-instance ``__dict__`` (the previous layout).
+
+    python benchmarks/bench_ast.py [functions]
+"""
+import sys
+import time
+import tracemalloc
+from lox.ast import Expr, Stmt
+from lox.parser import parse
+from lox.scanner import tokenize
+
+FUNCTION = """
+fun f{i}(a, b) {{
+  var total = 0;
+  for (var j = 0; j < b; j = j + 1) {{
+    if (a > j and !(j == 3)) total = total + (a - j) * 2 / (b + 1);
+    else total = total - 1;
+  }}
+  print total;
+}}
+"""
+
+
+def generate(functions: int) -> str:
+    return "".join(FUNCTION.format(i=i) for i in range(functions))
+
+
+_plain_classes = {}
+
+
+def plain(node):
+    """Copy an AST into __dict__-backed classes with the same fields."""
+    if isinstance(node, list):
+        return [plain(item) for item in node]
+    if not isinstance(node, (Expr, Stmt)):
+        return node
+    cls = type(node)
+    if cls not in _plain_classes:
+        _plain_classes[cls] = type(cls.__name__, (), {"__match_args__": cls.__match_args__})
+    copy = _plain_classes[cls]()
+    for name in cls.__match_args__:
+        setattr(copy, name, plain(getattr(node, name)))
+    return copy
+
+
+def walk(node) -> int:
+    node_classes = {*_plain_classes, *_plain_classes.values()}
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif type(node) in node_classes:
+            count += 1
+            for name in type(node).__match_args__:
+                stack.append(getattr(node, name))
+    return count
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return tree, size
+
+
+def traverse(tree, repeat: int = 5) -> tuple[int, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        nodes = walk(tree)
+        best = min(best, time.perf_counter() - start)
+    return nodes, best
+
+
+def main(functions: int = 2000):
+    tokens = tokenize(generate(functions))
+    slotted, slotted_size = measure(lambda: parse(tokens))
+    dicts, dict_size = measure(lambda: plain(slotted))
+    nodes, slotted_time = traverse(slotted)
+    _, dict_time = traverse(dicts)
+    print(f"nodes: {nodes}")
+    print(f"{'layout':<10}{'bytes':>12}{'bytes/node':>12}{'walk (ms)':>12}")
+    for name, size, elapsed in [
+        ("__dict__", dict_size, dict_time),
+        ("__slots__", slotted_size, slotted_time),
+    ]:
+        print(f"{name:<10}{size:>12}{size / nodes:>12.1f}{elapsed * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""Overhead of fuel and deadline metering on examples/benchmark.
+
+Each program runs with metering off (no current Budget), with an
+unlimited Budget, and with fuel and a deadline far above what it needs.
+
+    python benchmarks/bench_budget.py [program ...]
+"""
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from lox.budget import BUDGET, Budget
+from lox.errors import LoxRuntimeError, LoxStaticError
+from lox.interpreter import exec, define_natives, Env
+from lox.parser import parse
+from lox.scanner import tokenize
+from lox.scopes import analyze_scopes
+from suite import programs
+
+
+def run(program, budget: Budget | None) -> float:
+    env = Env()
+    define_natives(env)
+    token = BUDGET.set(budget)
+    try:
+        with redirect_stdout(StringIO()):
+            start = time.perf_counter()
+            exec(program, env)
+            return time.perf_counter() - start
+    finally:
+        BUDGET.reset(token)
+
+
+def compare(program, repeat: int = 5) -> list[float]:
+    best = [float("inf")] * 3
+    for _ in range(repeat):
+        budgets = [None, Budget(), Budget(fuel=10**12, timeout=10**6)]
+        for i, budget in enumerate(budgets):
+            best[i] = min(best[i], run(program, budget))
+    return best
+
+
+def main(names: list[str]):
+    print(f"{'program':<18}{'off (ms)':>10}{'counting':>12}{'limits':>12}")
+    for name, source in programs(names).items():
+        try:
+            program = parse(tokenize(source))
+            analyze_scopes(program)
+            off, counting, limited = compare(program)
+        except (LoxStaticError, LoxRuntimeError):
+            print(f"{name:<18}{'unsupported':>10}")
+            continue
+        print(f"{name:<18}{off * 1000:>10.1f}"
+              f"{(counting / off - 1) * 100:>+11.1f}%{(limited / off - 1) * 100:>+11.1f}%")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
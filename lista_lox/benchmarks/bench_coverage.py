@@ -0,0 +1,37 @@
+"""Cost of running with coverage counters on the benchmark programs.
+
+    python benchmarks/bench_coverage.py [program ...]
+"""
+import sys
+import time
+from lox.__main__ import Lox
+from lox.coverage import Coverage
+from lox.errors import LoxStaticError
+from suite import programs
+
+
+def run(source: str, coverage: Coverage | None) -> float | None:
+    # The programs print their own timings, so outputs are not compared here.
+    prepared = Lox(coverage=coverage).prepare(source)
+    start = time.perf_counter()
+    result = prepared.run()
+    elapsed = time.perf_counter() - start
+    return elapsed if result.ok else None
+
+
+def main(names: list[str]):
+    print(f"{'program':<18}{'plain (s)':>10}{'coverage (s)':>14}{'overhead':>10}")
+    for name, source in programs(names).items():
+        try:
+            plain = run(source, None)
+            covered = run(source, Coverage())
+        except LoxStaticError:
+            plain = covered = None
+        if plain is None or covered is None:
+            print(f"{name:<18}{'unsupported':>10}")
+            continue
+        print(f"{name:<18}{plain:>10.3f}{covered:>14.3f}{covered / plain:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
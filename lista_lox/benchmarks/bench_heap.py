@@ -0,0 +1,77 @@
+"""Overhead of heap accounting on allocation-heavy programs.
+
+Runs each program with accounting off (no current Heap), counting only,
+and counting against limits.
+
+    python benchmarks/bench_heap.py [scale]
+"""
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from lox.heap import HEAP, Heap
+from lox.interpreter import exec, Env
+from lox.parser import parse
+from lox.scanner import tokenize
+from lox.scopes import analyze_scopes
+
+PROGRAMS = {
+    "instances": """
+class Node {}
+fun make(depth) { if (depth > 0) { make(depth - 1); make(depth - 1); } return Node(); }
+for (var i = 0; i < {n}; i = i + 1) make(6);
+""",
+    "strings": """
+var s = "";
+for (var i = 0; i < {n}; i = i + 1) {
+  s = "a" + i;
+  var t = s + s + "b";
+}
+print s;
+""",
+    "calls": """
+fun add(a, b) { return a + b; }
+var total = 0;
+for (var i = 0; i < {n}; i = i + 1) {
+  fun local(x) { return add(x, i); }
+  total = local(total);
+}
+print total;
+""",
+}
+
+LIMITS = {"instances": 10**9, "strings": 10**9, "string_chars": 10**12, "scopes": 10**9, "functions": 10**9}
+
+
+def run(program, heap: Heap | None) -> float:
+    token = HEAP.set(heap)
+    try:
+        with redirect_stdout(StringIO()):
+            start = time.perf_counter()
+            exec(program, Env())
+            return time.perf_counter() - start
+    finally:
+        HEAP.reset(token)
+
+
+def compare(program, repeat: int = 9) -> tuple[float, float, float]:
+    # Modes are interleaved so that machine noise hits all of them alike.
+    best = [float("inf")] * 3
+    for _ in range(repeat):
+        for i, heap in enumerate([None, Heap(), Heap(dict(LIMITS))]):
+            best[i] = min(best[i], run(program, heap))
+    return tuple(best)
+
+
+def main(scale: int = 200):
+    print(f"{'program':<12}{'off (ms)':>10}{'counting':>12}{'limits':>12}")
+    for name, template in PROGRAMS.items():
+        program = parse(tokenize(template.replace("{n}", str(scale * (1 if name == "instances" else 20)))))
+        analyze_scopes(program)
+        off, counting, limited = compare(program)
+        print(f"{name:<12}{off * 1000:>10.1f}"
+              f"{(counting / off - 1) * 100:>+11.1f}%{(limited / off - 1) * 100:>+11.1f}%")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,67 @@
+"""A script importing a large shared library, run repeatedly.
+
+Compares a cold module cache (library re-parsed every run), the in-process
+cache, and a fresh process cache backed by an on-disk cache directory.
+
+    python benchmarks/bench_modules.py [functions] [runs]
+"""
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from lox.__main__ import Lox
+from lox.modules import MODULES
+
+FUNCTION = """
+fun helper{i}(a, b) {{
+  if (a > b) return a - b * {i};
+  var total = 0;
+  while (a < b) {{ total = total + a / 2; a = a + 1; }}
+  return total;
+}}
+"""
+
+
+def run_script(script: Path) -> float:
+    source = script.read_text(encoding="utf-8")
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        error = Lox().run(source, str(script))
+    assert not error, error
+    return time.perf_counter() - start
+
+
+def main(functions: int = 2000, runs: int = 10):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "lib.lox").write_text("".join(FUNCTION.format(i=i) for i in range(functions)))
+        script = root / "main.lox"
+        script.write_text('import "lib.lox";\nprint helper7(3, 10);\n')
+
+        cold = []
+        for _ in range(runs):
+            MODULES.clear()
+            cold.append(run_script(script))
+        warm = [run_script(script) for _ in range(runs)]
+
+        MODULES.cache_dir = str(root / "cache")
+        MODULES.clear()
+        run_script(script)
+        disk = []
+        for _ in range(runs):
+            MODULES.clear()
+            disk.append(run_script(script))
+        MODULES.cache_dir = None
+
+    print(f"library: {functions} functions, {runs} runs each")
+    print(f"{'cache':<22}{'mean (ms)':>12}{'speedup':>10}")
+    base = sum(cold) / runs
+    for name, times in [("none (re-parse)", cold), ("in-process", warm), ("on-disk, new process", disk)]:
+        mean = sum(times) / runs
+        print(f"{name:<22}{mean * 1000:>12.2f}{base / mean:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,45 @@
+"""Print-heavy program written through print() versus the buffered sink.
+
+    python benchmarks/bench_output.py [lines]
+"""
+import os
+import sys
+import tempfile
+import time
+from lox.__main__ import Lox
+from lox.output import CallbackOutput
+
+PROGRAM = """
+for (var i = 0; i < {n}; i = i + 1) {
+  print i;
+  print i / 8;
+  print "line " + i;
+}
+"""
+
+
+def timed(output, source: str) -> float:
+    start = time.perf_counter()
+    Lox(output=output).run(source)
+    return time.perf_counter() - start
+
+
+def main(lines: int = 30000):
+    source = PROGRAM.replace("{n}", str(lines // 3))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            unbuffered = min(timed(CallbackOutput(lambda text: print(text, file=file, flush=True)), source)
+                             for _ in range(3))
+        with open(path, "w", encoding="utf-8") as file:
+            buffered = min(timed(file, source) for _ in range(3))
+        collected = min(timed([], source) for _ in range(3))
+    print(f"{lines} lines")
+    print(f"{'sink':<22}{'time (ms)':>10}")
+    print(f"{'print() per line':<22}{unbuffered * 1000:>10.1f}")
+    print(f"{'buffered file':<22}{buffered * 1000:>10.1f}")
+    print(f"{'list':<22}{collected * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
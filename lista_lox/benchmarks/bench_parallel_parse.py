@@ -0,0 +1,48 @@
+"""Scaling of parse_parallel from 1 to N worker processes.
+
+    python benchmarks/bench_parallel_parse.py [declarations] [max workers]
+"""
+import os
+import sys
+import time
+from lox.parallel_parse import parse_parallel
+from lox.parser import parse
+from lox.scanner import tokenize
+
+DECLARATIONS = """
+var a{i} = {i} * 2 + 1;
+fun f{i}(x, y) {{
+  if (x > y and !(x == {i})) return (x - y) / 2;
+  while (x < y) x = x + 1;
+  return a{i};
+}}
+class C{i} {{
+  m(y) {{ for (var j = 0; j < y; j = j + 1) print j + {i}; }}
+  n() {{ print "c{i}"; }}
+}}
+"""
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(declarations: int = 5000, max_workers: int = os.cpu_count() or 1):
+    source = "".join(DECLARATIONS.format(i=i) for i in range(declarations))
+    tokens = tokenize(source)
+    print(f"{len(tokens)} tokens, {declarations * 3} top-level declarations")
+    serial = best_of(lambda: parse(tokens))
+    print(f"{'workers':>8}{'time (s)':>10}{'speedup':>10}")
+    print(f"{'serial':>8}{serial:>10.3f}{1:>9.2f}x")
+    for workers in range(1, max_workers + 1):
+        elapsed = best_of(lambda: parse_parallel(tokens, workers, min_tokens=0))
+        print(f"{workers:>8}{elapsed:>10.3f}{serial / elapsed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
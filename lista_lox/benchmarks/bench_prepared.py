@@ -0,0 +1,41 @@
+"""Lox.run per input versus one Lox.prepare and many PreparedProgram.run.
+
+    python benchmarks/bench_prepared.py [inputs]
+"""
+import sys
+import time
+from lox.__main__ import Lox
+
+SCRIPT = "".join(f"""
+fun rule{i}(x) {{
+  if (x > {i}) return x - {i};
+  return {i} - x;
+}}
+""" for i in range(200)) + """
+var total = 0;
+total = total + rule7(input) + rule42(input) + rule199(input);
+print total;
+"""
+
+
+def main(inputs: int = 200):
+    start = time.perf_counter()
+    for n in range(inputs):
+        Lox(output=[]).run(f"var input = {n};\n" + SCRIPT)
+    reparsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    prepared = Lox().prepare(SCRIPT)
+    results = [prepared.run({"input": n}) for n in range(inputs)]
+    amortized = time.perf_counter() - start
+    assert all(result.ok for result in results)
+
+    print(f"{inputs} inputs")
+    print(f"{'mode':<18}{'total (s)':>10}{'per run (ms)':>14}")
+    print(f"{'run(source)':<18}{reparsed:>10.3f}{reparsed / inputs * 1000:>14.2f}")
+    print(f"{'prepare + run':<18}{amortized:>10.3f}{amortized / inputs * 1000:>14.2f}")
+    print(f"front end once: {prepared.prepare_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
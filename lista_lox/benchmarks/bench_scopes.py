@@ -0,0 +1,82 @@
+"""Scope allocations and run time with and without scope escape analysis.
+
+    python benchmarks/bench_scopes.py [iterations]
+"""
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from lox import env
+from lox.interpreter import exec, Env
+from lox.parser import parse
+from lox.scanner import tokenize
+from lox.scopes import analyze_scopes
+
+PROGRAMS = {
+    "nested for": """
+var sum = 0;
+for (var i = 0; i < {n}; i = i + 1) {
+  for (var j = 0; j < 10; j = j + 1) {
+    var k = i * j;
+    sum = sum + k;
+  }
+}
+print sum;
+""",
+    "while + blocks": """
+var i = 0;
+var total = 0;
+while (i < {n}) {
+  var half = i / 2;
+  if (half > 10) { var extra = half - 10; total = total + extra; }
+  else { total = total + half; }
+  i = i + 1;
+}
+print total;
+""",
+}
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+        self.original = env.Env.__init__
+
+    def __enter__(self):
+        original = self.original
+
+        def counting_init(env_self, *args, **kwargs):
+            self.count += 1
+            original(env_self, *args, **kwargs)
+
+        env.Env.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc):
+        env.Env.__init__ = self.original
+
+
+def run(source: str, analyze: bool) -> tuple[int, float, str]:
+    program = parse(tokenize(source))
+    if analyze:
+        analyze_scopes(program)
+    globals_env = Env()
+    with Counter() as counter, redirect_stdout(StringIO()) as out:
+        start = time.perf_counter()
+        exec(program, globals_env)
+        elapsed = time.perf_counter() - start
+    return counter.count, elapsed, out.getvalue()
+
+
+def main(iterations: int = 2000):
+    print(f"{'program':<16}{'mode':<10}{'scopes':>10}{'time (ms)':>12}")
+    for name, template in PROGRAMS.items():
+        source = template.replace("{n}", str(iterations))
+        results = {mode: run(source, mode == "analyzed") for mode in ("baseline", "analyzed")}
+        assert results["baseline"][2] == results["analyzed"][2]
+        for mode, (count, elapsed, _) in results.items():
+            print(f"{name:<16}{mode:<10}{count:>10}{elapsed * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
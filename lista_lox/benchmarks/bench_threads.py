@@ -0,0 +1,50 @@
+"""Throughput of independent Lox instances on a ThreadPoolExecutor.
+
+Meaningful scaling needs a free-threaded CPython (3.13t+); on a regular
+build the GIL serializes the interpreters and this measures contention.
+
+    python benchmarks/bench_threads.py [jobs] [max threads]
+"""
+import os
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+from lox.__main__ import Lox
+
+PROGRAM = """
+fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+var total = 0;
+for (var i = 0; i < 3; i = i + 1) total = total + fib(14);
+print total;
+"""
+
+
+def job(_) -> str:
+    lines = []
+    error = Lox(output=lines).run(PROGRAM)
+    assert not error, error
+    return lines[0]
+
+
+def main(jobs: int = 32, max_threads: int = max(4, os.cpu_count() or 1)):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(f"Python {sys.version.split()[0]}, free-threaded build: {free_threaded}, GIL enabled: {gil}")
+    print(f"{jobs} jobs, {os.cpu_count()} cores")
+    print(f"{'threads':>8}{'time (s)':>10}{'jobs/s':>10}{'speedup':>10}")
+    baseline = None
+    threads = 1
+    while threads <= max_threads:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = set(executor.map(job, range(jobs)))
+        elapsed = time.perf_counter() - start
+        assert len(results) == 1
+        baseline = baseline or elapsed
+        print(f"{threads:>8}{elapsed:>10.2f}{jobs / elapsed:>10.1f}{baseline / elapsed:>9.2f}x")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,36 @@
+"""The programs in examples/benchmark, scaled down for a tree-walker.
+
+The originals are sized for bytecode VMs and would run for hours here, so
+loop bounds and recursion depths are replaced before running.
+"""
+from pathlib import Path
+
+BENCHMARKS = Path(__file__).parent.parent / "examples" / "benchmark"
+
+SCALED = {
+    "binary_trees": [("var maxDepth = 14;", "var maxDepth = 6;")],
+    "equality": [("10000000", "5000")],
+    "fib": [("fib(35) == 9227465", "fib(18) == 2584")],
+    "instantiation": [("500000", "5000")],
+    "invocation": [("500000", "5000")],
+    "method_call": [("var n = 100000;", "var n = 1000;")],
+    "properties": [("500000", "5000")],
+    "string_equality": [("100000", "300")],
+    "trees": [("Tree(8)", "Tree(5)"), ("i < 100;", "i < 1;")],
+    "zoo": [("10000000", "60000")],
+    "zoo_batch": [("clock() - start < 10", "batch < 3"), ("i < 10000", "i < 1000")],
+}
+
+
+def programs(names: list[str] | None = None) -> dict[str, str]:
+    sources = {}
+    for path in sorted(BENCHMARKS.glob("*.lox")):
+        name = path.stem
+        if names and name not in names:
+            continue
+        source = path.read_text(encoding="utf-8")
+        for original, scaled in SCALED.get(name, []):
+            assert original in source, (name, original)
+            source = source.replace(original, scaled)
+        sources[name] = source
+    return sources
@@ -1,23 +1,163 @@
-from lox.scanner import tokenize
-from lox.parser import parse
-from lox.interpreter import exec as interpreter_exec, Env
-from lox.errors import LoxRuntimeError, LoxStaticError
-from lox.ast import Program 
-
-class Lox:
-    def __init__(self):
-        self.env = Env()
-
-    def run(self, source: str) -> str:
-        try:
-            tokens = tokenize(source)
-            statements = parse(tokens)  
-            interpreter_exec(statements, self.env)
-            return ""  
-        except LoxRuntimeError as e:
-            print(f"runtime error: {e}")
-            return f"runtime error: {e}"
-        except LoxStaticError as e:
-            for error in e.errors:
-                print(error)
-            return "\n".join(str(err) for err in e.errors)
\ No newline at end of file
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from lox.scanner import tokenize
+from lox.parser import parse
+from lox.interpreter import Env, Function
+from lox.errors import LoxRuntimeError, LoxStaticError
+from lox.ast import Program 
+from lox.engines import ENGINES, DEFAULT_ENGINE, get_engine
+from lox.parallel_parse import parse_parallel
+from lox.modules import MODULES
+from lox.heap import Heap
+from lox.budget import Budget
+from lox.output import make_output
+from lox.prepared import PreparedProgram, new_env, run_context
+from lox.vectorize import vectorize, Vectorized
+from lox.aio import run_async
+from lox.coverage import Coverage
+from lox.memo import DEFAULT_SIZE as DEFAULT_MEMO_SIZE, Memo
+from lox.purity import analyze_purity
+
+class Lox:
+    """A Lox interpreter with its own global environment.
+
+    Lox instances share no mutable state, so independent instances can run
+    programs in parallel threads. A single instance runs one program at a
+    time; cancel() is the only method meant to be called from other threads.
+    """
+
+    def __init__(self, engine: str = DEFAULT_ENGINE, parse_workers: int = 1,
+                 heap_limits: dict[str, int] | None = None, output=None,
+                 coverage: Coverage | None = None, memoize: bool = False,
+                 memo_size: int = DEFAULT_MEMO_SIZE):
+        self.env = new_env()
+        self.output = make_output(output)
+        self.engine = get_engine(engine)
+        self.parse_workers = parse_workers
+        self.heap_limits = dict(heap_limits or {})
+        self.heap = Heap(self.heap_limits)
+        self.budget = Budget()
+        self.running = threading.Lock()
+        self.coverage = coverage
+        self.memoize = memoize
+        self.memo_size = memo_size
+        self.memo: Memo | None = None
+
+    def prepare(self, source: str, path: str | None = None) -> PreparedProgram:
+        """Tokenize, parse and analyze source; raises LoxStaticError"""
+        start = time.perf_counter()
+        tokens = tokenize(source)
+        program = parse_parallel(tokens, self.parse_workers)
+        if path is None:
+            MODULES.resolve(program, os.getcwd())
+        else:
+            path = os.path.abspath(path)
+            MODULES.resolve(program, os.path.dirname(path), (path,))
+        program = self.engine.prepare(program)
+        if self.memoize:
+            analyze_purity(program)
+        if self.coverage is not None:
+            program = self.coverage.instrument(program, path or "<script>", source)
+        return PreparedProgram(program, self.engine, path, time.perf_counter() - start)
+
+    def run(self, source: str, path: str | None = None, *,
+            fuel: int | None = None, timeout: float | None = None) -> str:
+        if not self.running.acquire(blocking=False):
+            raise RuntimeError("this Lox instance is already running a program")
+        try:
+            self.heap = Heap(self.heap_limits)
+            self.budget = Budget(fuel, timeout)
+            self.memo = Memo(self.memo_size) if self.memoize else None
+            with run_context(self.output, self.heap, self.budget, self.memo):
+                try:
+                    prepared = self.prepare(source, path)
+                    self.engine.execute(prepared.program, self.env)
+                    return ""  
+                except (LoxRuntimeError, LoxStaticError) as e:
+                    return self.report(e)
+        finally:
+            self.running.release()
+
+    async def run_async(self, source: str, path: str | None = None, *,
+                        fuel: int | None = None, timeout: float | None = None) -> str:
+        """Like run, as a coroutine that awaits async natives and yields in loops"""
+        if not self.running.acquire(blocking=False):
+            raise RuntimeError("this Lox instance is already running a program")
+        try:
+            self.heap = Heap(self.heap_limits)
+            self.budget = Budget(fuel, timeout)
+            self.memo = Memo(self.memo_size) if self.memoize else None
+            with run_context(self.output, self.heap, self.budget, self.memo):
+                try:
+                    prepared = self.prepare(source, path)
+                    await run_async(prepared.program, self.env)
+                    return ""
+                except (LoxRuntimeError, LoxStaticError) as e:
+                    return self.report(e)
+        finally:
+            self.running.release()
+
+    def report(self, error: LoxRuntimeError | LoxStaticError) -> str:
+        if isinstance(error, LoxRuntimeError):
+            self.output.write_line(f"runtime error: {error}")
+            return f"runtime error: {error}"
+        for static_error in error.errors:
+            self.output.write_line(str(static_error))
+        return "\n".join(str(err) for err in error.errors)
+
+    def cancel(self) -> None:
+        """Stop the current run from another thread"""
+        self.budget.cancel()
+
+    def vectorize(self, fn_name: str) -> Vectorized:
+        function = self.env[fn_name]
+        if not isinstance(function, Function):
+            raise TypeError(f"'{fn_name}' is not a Lox function")
+        return vectorize(function)
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="pylox")
+    parser.add_argument("script", nargs="?", help="Lox file to run (reads stdin if omitted)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default=DEFAULT_ENGINE)
+    parser.add_argument("--module-cache", metavar="DIR",
+                        help="keep analyzed modules in DIR across runs")
+    parser.add_argument("--fuel", type=int, help="maximum loop iterations plus calls")
+    parser.add_argument("--timeout", type=float, help="wall-clock limit in seconds")
+    parser.add_argument("--parse-workers", type=int, default=1, metavar="N",
+                        help="parse top-level declarations in N processes (0: one per core)")
+    parser.add_argument("--coverage", metavar="FILE",
+                        help="write statement and branch coverage to FILE in LCOV format")
+    parser.add_argument("--coverage-lines", metavar="FILE",
+                        help="write the script annotated with per-line hit counts to FILE")
+    parser.add_argument("--memoize", action="store_true",
+                        help="cache results of pure functions and report cache statistics")
+    args = parser.parse_args(argv)
+    if args.script is None:
+        source = sys.stdin.read()
+    else:
+        with open(args.script, encoding="utf-8") as file:
+            source = file.read()
+    if args.module_cache:
+        MODULES.cache_dir = args.module_cache
+    coverage = Coverage() if args.coverage or args.coverage_lines else None
+    lox = Lox(engine=args.engine, parse_workers=args.parse_workers or None, coverage=coverage,
+              memoize=args.memoize)
+    error = lox.run(source, args.script, fuel=args.fuel, timeout=args.timeout)
+    if lox.memo is not None and lox.memo.tables:
+        print(lox.memo.report(), file=sys.stderr)
+    if coverage is not None and coverage.counters:
+        if args.coverage:
+            Path(args.coverage).write_text(coverage.lcov(), encoding="utf-8")
+        if args.coverage_lines:
+            script = coverage.counters[0].path
+            Path(args.coverage_lines).write_text(coverage.annotate(script), encoding="utf-8")
+    if not error:
+        return 0
+    return 70 if error.startswith("runtime error") else 65
+
+if __name__ == "__main__":
+    sys.exit(main())
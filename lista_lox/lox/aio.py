@@ -0,0 +1,272 @@
+"""Running Lox programs as asyncio tasks.
+
+run_async executes a program cooperatively: natives with an async
+implementation (sleep, readFile) are awaited, and loops hand control back
+to the event loop every YIELD_INTERVAL iterations, so many scripts can
+share one event loop.
+
+Only nodes that can reach an await point (calls, loops and imports, and
+everything containing them) go through the async functions below; every
+other statement or expression is handed to the regular interpreter. The
+async versions evaluate their subexpressions and then let the interpreter
+apply the operation to the results, so both modes raise the same errors.
+"""
+import asyncio
+from dataclasses import fields, replace
+from functools import singledispatch
+from typing import Any
+from lox.ast import *
+from lox.budget import charge
+from lox.heap import allocate
+from lox.interpreter import (
+    BoundMethod, Env, Function, MemoizedFunction, NativeFunction, ReturnValue, eval, exec,
+    is_truthy, stringify,
+)
+from lox.memo import MISSING, memo_key
+from lox.modules import MODULES
+from lox.output import OUTPUT
+
+YIELD_INTERVAL = 64
+
+
+class AsyncRun:
+    def __init__(self):
+        self.suspending: set[int] = set()
+        self.analyzed: set[int] = set()
+        self.back_edges = 0
+
+    def analyze(self, node: Program | FunctionStmt) -> None:
+        if id(node) not in self.analyzed:
+            self.analyzed.add(id(node))
+            mark_suspending(node, self)
+
+    async def back_edge(self) -> None:
+        charge()
+        self.back_edges += 1
+        if self.back_edges % YIELD_INTERVAL == 0:
+            await asyncio.sleep(0)
+
+
+def mark_suspending(node: Any, run: AsyncRun) -> bool:
+    """Record the ids of nodes under node that may await; True if node may"""
+    match node:
+        case list():
+            return any([mark_suspending(child, run) for child in node])
+        case FunctionStmt():
+            run.analyzed.add(id(node))
+            mark_suspending(node.body, run)
+            return False
+        case ClassStmt():
+            for method in node.methods:
+                run.analyzed.add(id(method))
+                mark_suspending(method.body, run)
+            return False
+        case Expr() | Stmt():
+            suspends = isinstance(node, (Call, While, Import))
+            for field in fields(node):
+                suspends |= mark_suspending(getattr(node, field.name), run)
+            if suspends:
+                run.suspending.add(id(node))
+            return suspends
+        case _:
+            return False
+
+
+async def run_async(program: Program, env: Env) -> None:
+    run = AsyncRun()
+    run.analyze(program)
+    await aexec(program, env, run)
+
+
+async def aexec(stmt: Stmt, env: Env, run: AsyncRun) -> None:
+    if id(stmt) in run.suspending:
+        await exec_suspending(stmt, env, run)
+    else:
+        exec(stmt, env)
+
+
+async def aeval(expr: Expr, env: Env, run: AsyncRun) -> Any:
+    if id(expr) in run.suspending:
+        return await eval_suspending(expr, env, run)
+    return eval(expr, env)
+
+
+@singledispatch
+async def exec_suspending(stmt: Stmt, env: Env, run: AsyncRun) -> None:
+    msg = f"async exec not implemented for {type(stmt)}"
+    raise TypeError(msg)
+
+
+@exec_suspending.register
+async def _(stmt: Program, env: Env, run: AsyncRun) -> None:
+    for child in stmt.statements:
+        await aexec(child, env, run)
+
+
+@exec_suspending.register
+async def _(stmt: Expression, env: Env, run: AsyncRun) -> None:
+    await aeval(stmt.expression, env, run)
+
+
+@exec_suspending.register
+async def _(stmt: Print, env: Env, run: AsyncRun) -> None:
+    value = await aeval(stmt.expression, env, run)
+    OUTPUT.get().write_line(stringify(value))
+
+
+@exec_suspending.register
+async def _(stmt: Var, env: Env, run: AsyncRun) -> None:
+    value = await aeval(stmt.initializer, env, run) if stmt.initializer is not None else None
+    env[stmt.name.lexeme] = value
+
+
+@exec_suspending.register
+async def _(stmt: Return, env: Env, run: AsyncRun) -> None:
+    value = await aeval(stmt.value, env, run) if stmt.value is not None else None
+    raise ReturnValue(value)
+
+
+@exec_suspending.register
+async def _(stmt: Block, env: Env, run: AsyncRun) -> None:
+    match stmt.scope:
+        case "none":
+            for statement in stmt.statements:
+                await aexec(statement, env, run)
+        case "reuse":
+            if env.spare is None:
+                allocate("scopes")
+            inner_env = env.scratch()
+            try:
+                for statement in stmt.statements:
+                    await aexec(statement, inner_env, run)
+            finally:
+                inner_env.values.clear()
+        case _:
+            allocate("scopes")
+            inner_env = env.push()
+            for statement in stmt.statements:
+                await aexec(statement, inner_env, run)
+
+
+@exec_suspending.register
+async def _(stmt: If, env: Env, run: AsyncRun) -> None:
+    condition = await aeval(stmt.condition, env, run)
+    if is_truthy(condition):
+        await aexec(stmt.then_branch, env, run)
+    elif stmt.else_branch is not None:
+        await aexec(stmt.else_branch, env, run)
+
+
+@exec_suspending.register
+async def _(stmt: While, env: Env, run: AsyncRun) -> None:
+    while is_truthy(await aeval(stmt.condition, env, run)):
+        await aexec(stmt.body, env, run)
+        await run.back_edge()
+
+
+@exec_suspending.register
+async def _(stmt: Import, env: Env, run: AsyncRun) -> None:
+    root = env.root()
+    if root.modules is None:
+        root.modules = set()
+    if stmt.resolved in root.modules:
+        return
+    root.modules.add(stmt.resolved)
+    program = MODULES.load(stmt.resolved).program
+    run.analyze(program)
+    await aexec(program, root, run)
+
+
+@singledispatch
+async def eval_suspending(expr: Expr, env: Env, run: AsyncRun) -> Any:
+    msg = f"cannot async eval {expr.__class__.__name__} objects"
+    raise TypeError(msg)
+
+
+@eval_suspending.register
+async def _(expr: Grouping, env: Env, run: AsyncRun) -> Any:
+    return await aeval(expr.expression, env, run)
+
+
+@eval_suspending.register
+async def _(expr: Unary, env: Env, run: AsyncRun) -> Any:
+    right = await aeval(expr.right, env, run)
+    return eval(replace(expr, right=Literal(right)), env)
+
+
+@eval_suspending.register
+async def _(expr: Binary, env: Env, run: AsyncRun) -> Any:
+    left = await aeval(expr.left, env, run)
+    right = await aeval(expr.right, env, run)
+    return eval(replace(expr, left=Literal(left), right=Literal(right)), env)
+
+
+@eval_suspending.register
+async def _(expr: Logical, env: Env, run: AsyncRun) -> Any:
+    left = await aeval(expr.left, env, run)
+    if expr.operator.type == "OR":
+        if is_truthy(left):
+            return left
+    elif expr.operator.type == "AND":
+        if not is_truthy(left):
+            return left
+    return await aeval(expr.right, env, run)
+
+
+@eval_suspending.register
+async def _(expr: Assign, env: Env, run: AsyncRun) -> Any:
+    value = await aeval(expr.value, env, run)
+    return eval(replace(expr, value=Literal(value)), env)
+
+
+@eval_suspending.register
+async def _(expr: Get, env: Env, run: AsyncRun) -> Any:
+    obj = await aeval(expr.object, env, run)
+    return eval(replace(expr, object=Literal(obj)), env)
+
+
+@eval_suspending.register
+async def _(expr: Call, env: Env, run: AsyncRun) -> Any:
+    callee = await aeval(expr.callee, env, run)
+    arguments = [await aeval(arg, env, run) for arg in expr.arguments]
+    function = callee.function if isinstance(callee, BoundMethod) else callee
+    if hasattr(function, "arity") and len(arguments) == function.arity():
+        if isinstance(function, MemoizedFunction):
+            return await call_memoized(function, arguments, run)
+        if isinstance(function, Function):
+            return await call_function(function, arguments, run)
+        if isinstance(function, NativeFunction) and function.coroutine is not None:
+            return await function.coroutine(*arguments)
+    # Everything else, including the error cases, is a synchronous call.
+    call = replace(expr, callee=Literal(callee), arguments=[Literal(arg) for arg in arguments])
+    return eval(call, env)
+
+
+async def call_function(function: Function, arguments: list[Any], run: AsyncRun) -> Any:
+    declaration = function.declaration
+    run.analyze(declaration)
+    charge(declaration.name)
+    allocate("scopes", declaration.name)
+    local_env = Env(enclosing=function.closure)
+    for param, arg in zip(declaration.params, arguments):
+        local_env[param.lexeme] = arg
+    try:
+        for statement in declaration.body:
+            await aexec(statement, local_env, run)
+    except ReturnValue as result:
+        return result.value
+    return None
+
+
+async def call_memoized(function: MemoizedFunction, arguments: list[Any], run: AsyncRun) -> Any:
+    key = memo_key(arguments)
+    if key is None:
+        function.table.uncached += 1
+        return await call_function(function, arguments, run)
+    value = function.table.get(key)
+    if value is MISSING:
+        value = await call_function(function, arguments, run)
+        function.table.put(key, value)
+    else:
+        charge(function.declaration.name)
+    return value
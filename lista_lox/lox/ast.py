@@ -1,116 +1,131 @@
-from dataclasses import dataclass
-from typing import Any
-from .tokens import Token
-
-class Expr:
-    """Abstract Base Class for expressions"""
-
-class Stmt:
-    """Abstract Base Class for statements"""
-
-@dataclass
-class Expression(Stmt):
-    expression: Expr
-
-@dataclass
-class Print(Stmt):
-    expression: Expr
-
-@dataclass
-class Binary(Expr):
-    left: Expr
-    operator: Token
-    right: Expr
-
-@dataclass
-class Grouping(Expr):
-    expression: Expr
-
-@dataclass
-class Literal(Expr):
-    value: Any
-
-@dataclass
-class Unary(Expr):
-    operator: Token
-    right: Expr
-
-@dataclass
-class Program(Stmt):
-    statements: list[Stmt]
-
-@dataclass
-class Var(Stmt):
-    name: Token
-    initializer: Expr
-
-@dataclass
-class Variable(Expr):
-    name: Token 
-
-@dataclass
-class Assign(Expr):
-    name: Token
-    value: Expr
-
-@dataclass
-class Block(Stmt):
-    statements: list[Stmt]
-
-@dataclass
-class If(Stmt):
-    condition: Expr
-    then_branch: Stmt
-    else_branch: Stmt | None
-
-@dataclass
-class Logical(Expr):
-    left: Expr
-    operator: Token
-    right: Expr
-
-@dataclass
-class While(Stmt):
-    condition: Expr
-    body: Stmt
-
-@dataclass
-class ClassStmt(Stmt):
-    def __init__(self, name: Token, methods: list[Stmt]):
-        self.name = name
-        self.methods = methods
-
-@dataclass
-class FunctionStmt(Stmt):
-    name: Token
-    parameters: list[Token]
-    body: list[Stmt]
-
-
-@dataclass
-class MethodCall(Expr):
-    object: Expr 
-    method: Token  
-
-@dataclass
-class Get(Expr):
-    object: Expr
-    name: Token
-
-@dataclass
-class Call(Expr):
-    callee: Expr
-    paren: Token
-    arguments: list[Expr]
-
-@dataclass
-class MethodReference(Expr):
-    object_expr: Expr 
-    method_name: Token 
-
-@dataclass
-class FunctionStmt(Stmt):
-    def __init__(self, name, params, body):
-        self.name = name
-        self.params = params
-        self.body = body
\ No newline at end of file
+from dataclasses import dataclass
+from typing import Any
+from .tokens import Token
+
+class Expr:
+    """Abstract Base Class for expressions"""
+    __slots__ = ()
+
+class Stmt:
+    """Abstract Base Class for statements"""
+    __slots__ = ()
+
+@dataclass(slots=True)
+class Expression(Stmt):
+    expression: Expr
+
+@dataclass(slots=True)
+class Print(Stmt):
+    expression: Expr
+    keyword: Token | None = None
+
+@dataclass(slots=True)
+class Binary(Expr):
+    left: Expr
+    operator: Token
+    right: Expr
+
+@dataclass(slots=True)
+class Grouping(Expr):
+    expression: Expr
+
+@dataclass(slots=True)
+class Literal(Expr):
+    value: Any
+
+@dataclass(slots=True)
+class Unary(Expr):
+    operator: Token
+    right: Expr
+
+@dataclass(slots=True)
+class Program(Stmt):
+    statements: list[Stmt]
+
+@dataclass(slots=True)
+class Var(Stmt):
+    name: Token
+    initializer: Expr
+
+@dataclass(slots=True)
+class Variable(Expr):
+    name: Token 
+
+@dataclass(slots=True)
+class Assign(Expr):
+    name: Token
+    value: Expr
+
+@dataclass(slots=True)
+class Block(Stmt):
+    statements: list[Stmt]
+    # Set by lox.scopes: "fresh" scope per run, a "reuse"d scratch scope or
+    # "none" when the block declares nothing.
+    scope: str = "fresh"
+
+@dataclass(slots=True)
+class If(Stmt):
+    condition: Expr
+    then_branch: Stmt
+    else_branch: Stmt | None
+    keyword: Token | None = None
+
+@dataclass(slots=True)
+class Logical(Expr):
+    left: Expr
+    operator: Token
+    right: Expr
+
+@dataclass(slots=True)
+class While(Stmt):
+    condition: Expr
+    body: Stmt
+    # The ``while`` or ``for`` keyword; desugared loops have none.
+    keyword: Token | None = None
+
+@dataclass(slots=True)
+class Return(Stmt):
+    keyword: Token
+    value: Expr | None
+
+@dataclass(slots=True)
+class Import(Stmt):
+    keyword: Token
+    path: Token
+    # Absolute path of the module, filled in by lox.modules.
+    resolved: str | None = None
+
+@dataclass(slots=True)
+class ClassStmt(Stmt):
+    name: Token
+    methods: list["FunctionStmt"]
+
+@dataclass(slots=True)
+class FunctionStmt(Stmt):
+    name: Token
+    params: list[Token]
+    body: list[Stmt]
+    # Set by lox.purity for top-level functions whose results can be cached.
+    pure: bool = False
+
+
+@dataclass(slots=True)
+class MethodCall(Expr):
+    object: Expr 
+    method: Token  
+
+@dataclass(slots=True)
+class Get(Expr):
+    object: Expr
+    name: Token
+
+@dataclass(slots=True)
+class Call(Expr):
+    callee: Expr
+    paren: Token
+    arguments: list[Expr]
+
+@dataclass(slots=True)
+class MethodReference(Expr):
+    object_expr: Expr 
+    method_name: Token 
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""Fuel and wall-clock limits for a run.
+
+Work is charged at loop back-edges and function calls. The deadline and
+cancellation are only looked at every CHECK_INTERVAL charges, so a run
+without limits pays one counter increment per charge.
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from lox.errors import LoxRuntimeError
+from lox.tokens import Token
+
+CHECK_INTERVAL = 256
+
+
+@dataclass
+class Budget:
+    fuel: int | None = None
+    timeout: float | None = None
+    used: int = 0
+    cancelled: bool = False
+
+    def __post_init__(self):
+        self.deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        self.next_check = 0
+        self.schedule()
+
+    def schedule(self) -> None:
+        next_check = self.used + CHECK_INTERVAL
+        if self.fuel is not None:
+            next_check = min(next_check, self.fuel + 1)
+        self.next_check = next_check
+
+    def cancel(self) -> None:
+        """Stop the run at its next charge; safe to call from any thread"""
+        self.cancelled = True
+        self.next_check = 0
+
+    def check(self, token: Token | None) -> None:
+        if self.cancelled:
+            raise LoxRuntimeError("Execution cancelled.", token)
+        if self.fuel is not None and self.used > self.fuel:
+            raise LoxRuntimeError("Out of fuel.", token)
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise LoxRuntimeError("Timeout exceeded.", token)
+        self.schedule()
+
+
+BUDGET: ContextVar[Budget | None] = ContextVar("BUDGET", default=None)
+
+
+def charge(token: Token | None = None) -> None:
+    budget = BUDGET.get()
+    if budget is None:
+        return
+    budget.used += 1
+    if budget.used >= budget.next_check:
+        budget.check(token)
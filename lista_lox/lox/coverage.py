@@ -0,0 +1,253 @@
+"""Statement and branch coverage.
+
+Coverage.instrument rewrites a program once: every statement is wrapped in
+a Counted node and the conditions of ``if`` and ``while``, as well as the
+left operand of ``and``/``or``, in a BranchProbe that counts how often
+they were truthy and falsey. Running the rewritten tree costs one list
+increment per statement and per condition; reports are built from the
+counters afterwards and keyed by the line numbers stored on tokens.
+
+Only the instrumented program itself is counted, not the modules it
+imports.
+"""
+from dataclasses import dataclass, field, fields
+from functools import singledispatch
+from typing import Any, Callable, Iterator
+from lox.aio import AsyncRun, aeval, aexec, eval_suspending, exec_suspending
+from lox.ast import *
+from lox.interpreter import Env, Value, eval, exec
+from lox.tokens import Token
+
+LINE = "line"
+BRANCH = "branch"
+
+
+@dataclass
+class Counters:
+    path: str
+    # One entry per counter: (LINE, line) or (BRANCH, line, probe, branch).
+    sites: list[tuple] = field(default_factory=list)
+    hits: list[int] = field(default_factory=list)
+    probes: int = 0
+    last_line: int = 1
+
+    def add(self, *site: Any) -> int:
+        self.sites.append(site)
+        self.hits.append(0)
+        return len(self.hits) - 1
+
+
+@dataclass(slots=True)
+class Counted(Stmt):
+    statement: Stmt
+    counters: Counters
+    index: int
+    run: Callable = field(repr=False, compare=False)
+
+
+@dataclass(slots=True)
+class BranchProbe(Expr):
+    expression: Expr
+    counters: Counters
+    # Counter of the truthy outcome; the falsey one follows it.
+    index: int
+
+
+@exec.register
+def _(stmt: Counted, env: Env) -> None:
+    stmt.counters.hits[stmt.index] += 1
+    stmt.run(stmt.statement, env)
+
+
+@eval.register
+def _(expr: BranchProbe, env: Env) -> Value:
+    value = eval(expr.expression, env)
+    expr.counters.hits[expr.index + (value is None or value is False)] += 1
+    return value
+
+
+@exec_suspending.register
+async def _(stmt: Counted, env: Env, run: AsyncRun) -> None:
+    stmt.counters.hits[stmt.index] += 1
+    await aexec(stmt.statement, env, run)
+
+
+@eval_suspending.register
+async def _(expr: BranchProbe, env: Env, run: AsyncRun) -> Value:
+    value = await aeval(expr.expression, env, run)
+    expr.counters.hits[expr.index + (value is None or value is False)] += 1
+    return value
+
+
+def own_tokens(node: Any) -> Iterator[Token]:
+    """Tokens of node and its expressions, but not of nested statements"""
+    for child in fields(node):
+        value = getattr(node, child.name)
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, Token):
+                yield item
+            elif isinstance(item, Expr):
+                yield from own_tokens(item)
+
+
+def line_of(node: Any, counters: Counters) -> int:
+    # Nodes without tokens of their own (``print 1;``) are attributed to the
+    # last line seen before them.
+    lines = [token.line for token in own_tokens(node)]
+    if lines:
+        counters.last_line = min(lines)
+    return counters.last_line
+
+
+def count(stmt: Stmt, counters: Counters) -> Stmt:
+    if isinstance(stmt, Block):
+        return instrument_stmt(stmt, counters)
+    index = counters.add(LINE, line_of(stmt, counters))
+    stmt = instrument_stmt(stmt, counters)
+    return Counted(stmt, counters, index, exec.dispatch(type(stmt)))
+
+
+def probe(expr: Expr, counters: Counters) -> BranchProbe:
+    line = line_of(expr, counters)
+    probe_id = counters.probes
+    counters.probes += 1
+    index = counters.add(BRANCH, line, probe_id, 0)
+    counters.add(BRANCH, line, probe_id, 1)
+    return BranchProbe(instrument_expr(expr, counters), counters, index)
+
+
+@singledispatch
+def instrument_stmt(stmt: Stmt, counters: Counters) -> Stmt:
+    for child in fields(stmt):
+        value = getattr(stmt, child.name)
+        if isinstance(value, Expr):
+            setattr(stmt, child.name, instrument_expr(value, counters))
+    return stmt
+
+
+@instrument_stmt.register
+def _(stmt: Program, counters: Counters) -> Stmt:
+    stmt.statements = [count(child, counters) for child in stmt.statements]
+    return stmt
+
+
+@instrument_stmt.register
+def _(stmt: Block, counters: Counters) -> Stmt:
+    stmt.statements = [count(child, counters) for child in stmt.statements]
+    return stmt
+
+
+@instrument_stmt.register
+def _(stmt: If, counters: Counters) -> Stmt:
+    stmt.condition = probe(stmt.condition, counters)
+    stmt.then_branch = count(stmt.then_branch, counters)
+    if stmt.else_branch is not None:
+        stmt.else_branch = count(stmt.else_branch, counters)
+    return stmt
+
+
+@instrument_stmt.register
+def _(stmt: While, counters: Counters) -> Stmt:
+    stmt.condition = probe(stmt.condition, counters)
+    stmt.body = count(stmt.body, counters)
+    return stmt
+
+
+@instrument_stmt.register
+def _(stmt: FunctionStmt, counters: Counters) -> Stmt:
+    stmt.body = [count(child, counters) for child in stmt.body]
+    return stmt
+
+
+@instrument_stmt.register
+def _(stmt: ClassStmt, counters: Counters) -> Stmt:
+    for method in stmt.methods:
+        instrument_stmt(method, counters)
+    return stmt
+
+
+def instrument_expr(expr: Expr, counters: Counters) -> Expr:
+    if isinstance(expr, Logical):
+        expr.left = probe(expr.left, counters)
+        expr.right = instrument_expr(expr.right, counters)
+        return expr
+    for child in fields(expr):
+        value = getattr(expr, child.name)
+        if isinstance(value, Expr):
+            setattr(expr, child.name, instrument_expr(value, counters))
+        elif isinstance(value, list):
+            setattr(expr, child.name, [instrument_expr(item, counters) for item in value])
+    return expr
+
+
+@dataclass
+class FileCoverage:
+    path: str
+    lines: dict[int, int] = field(default_factory=dict)
+    branches: dict[tuple[int, int, int], int | None] = field(default_factory=dict)
+
+
+class Coverage:
+    """Counters of every program instrumented through this object"""
+
+    def __init__(self):
+        self.counters: list[Counters] = []
+        self.sources: dict[str, str] = {}
+
+    def instrument(self, program: Program, path: str = "<script>", source: str | None = None) -> Program:
+        counters = Counters(path)
+        self.counters.append(counters)
+        if source is not None:
+            self.sources[path] = source
+        return instrument_stmt(program, counters)
+
+    def files(self) -> dict[str, FileCoverage]:
+        """Hits per line (of its busiest statement) and per branch, summed over runs"""
+        files: dict[str, FileCoverage] = {}
+        for counters in self.counters:
+            report = files.setdefault(counters.path, FileCoverage(counters.path))
+            lines: dict[int, int] = {}
+            for site, hits in zip(counters.sites, counters.hits):
+                if site[0] == LINE:
+                    lines[site[1]] = max(lines.get(site[1], 0), hits)
+                else:
+                    key = site[1:]
+                    report.branches[key] = (report.branches.get(key) or 0) + hits
+            for line, hits in lines.items():
+                report.lines[line] = report.lines.get(line, 0) + hits
+        for report in files.values():
+            # LCOV marks both branches of a condition that never ran with "-".
+            for line, probe_id, branch in report.branches:
+                if branch == 0 and not report.branches[line, probe_id, 0] + report.branches[line, probe_id, 1]:
+                    report.branches[line, probe_id, 0] = report.branches[line, probe_id, 1] = None
+        return files
+
+    def lcov(self) -> str:
+        """The report in LCOV tracefile format"""
+        records = []
+        for report in self.files().values():
+            records.append("TN:")
+            records.append(f"SF:{report.path}")
+            for (line, probe_id, branch), hits in sorted(report.branches.items()):
+                records.append(f"BRDA:{line},{probe_id},{branch},{'-' if hits is None else hits}")
+            records.append(f"BRF:{len(report.branches)}")
+            records.append(f"BRH:{sum(1 for hits in report.branches.values() if hits)}")
+            for line, hits in sorted(report.lines.items()):
+                records.append(f"DA:{line},{hits}")
+            records.append(f"LF:{len(report.lines)}")
+            records.append(f"LH:{sum(1 for hits in report.lines.values() if hits)}")
+            records.append("end_of_record")
+        return "\n".join(records) + "\n"
+
+    def annotate(self, path: str) -> str:
+        """The source of path with hit counts in front of every line, like gcov"""
+        lines = self.files()[path].lines
+        annotated = []
+        for number, text in enumerate(self.sources[path].splitlines(), 1):
+            hits = lines.get(number)
+            if hits is None:
+                column = "-"
+            else:
+                column = str(hits) if hits else "#####"
+            annotated.append(f"{column:>9}:{number:>5}:{text}")
+        return "\n".join(annotated) + "\n"
@@ -0,0 +1,69 @@
+"""Execution engines.
+
+An engine turns a parsed Program into side effects on a global Env. Every
+engine must produce the same output and errors for the same program; the
+differential harness in tests/differential.py checks this over examples/.
+"""
+import asyncio
+from lox.aio import run_async
+from lox.ast import Program
+from lox.interpreter import exec as interpreter_exec, Env
+from lox.scopes import analyze_scopes
+
+
+class Engine:
+    name: str = ""
+
+    def prepare(self, program: Program) -> Program:
+        """Run the engine's front-end passes over a freshly parsed program"""
+        return program
+
+    def execute(self, program: Program, env: Env) -> None:
+        raise NotImplementedError
+
+
+class PlainEngine(Engine):
+    """Tree-walking interpreter without any analysis; the reference engine"""
+    name = "plain"
+
+    def execute(self, program: Program, env: Env) -> None:
+        interpreter_exec(program, env)
+
+
+class TreeWalkEngine(PlainEngine):
+    """Tree-walking interpreter over an analyzed AST"""
+    name = "treewalk"
+
+    def prepare(self, program: Program) -> Program:
+        analyze_scopes(program)
+        return program
+
+
+class AsyncEngine(TreeWalkEngine):
+    """Tree-walking interpreter running as an asyncio task, see lox.aio"""
+    name = "async"
+
+    def execute(self, program: Program, env: Env) -> None:
+        asyncio.run(run_async(program, env))
+
+
+ENGINES: dict[str, type[Engine]] = {}
+DEFAULT_ENGINE = "treewalk"
+
+
+def register_engine(engine: type[Engine]) -> type[Engine]:
+    ENGINES[engine.name] = engine
+    return engine
+
+
+def get_engine(name: str) -> Engine:
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        options = ", ".join(sorted(ENGINES))
+        raise ValueError(f"unknown engine '{name}' (available: {options})") from None
+
+
+register_engine(PlainEngine)
+register_engine(TreeWalkEngine)
+register_engine(AsyncEngine)
@@ -1,14 +1,20 @@
-class LoxRuntimeError(RuntimeError):
-    def __init__(self, message, token=None):
-        super().__init__(message)
-        self.token = token
-
-class LoxSyntaxError(SyntaxError):
-    def __init__(self, message, token=None):
-        super().__init__(message)
-        self.token = token
-
-class LoxStaticError(Exception):
-    def __init__(self, errors):
-        super().__init__("Static errors occurred")
+class LoxRuntimeError(RuntimeError):
+    def __init__(self, message, token=None):
+        super().__init__(message)
+        self.token = token
+
+    def __reduce__(self):
+        return (self.__class__, (self.args[0], self.token))
+
+class LoxSyntaxError(SyntaxError):
+    def __init__(self, message, token=None):
+        super().__init__(message)
+        self.token = token
+
+    def __reduce__(self):
+        return (self.__class__, (self.args[0], self.token))
+
+class LoxStaticError(Exception):
+    def __init__(self, errors):
+        super().__init__("Static errors occurred")
         self.errors = errors 
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""Allocation accounting for Lox-level objects.
+
+Each run gets a Heap, made current through a context variable, that counts
+instances, concatenated strings (and their characters), scopes and
+functions. A count going over its limit raises a LoxRuntimeError at the
+allocation site.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from lox.errors import LoxRuntimeError
+from lox.tokens import Token
+
+KINDS = ("instances", "strings", "string_chars", "scopes", "functions")
+
+
+@dataclass
+class Heap:
+    limits: dict[str, int] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=lambda: dict.fromkeys(KINDS, 0))
+
+    def __post_init__(self):
+        unknown = set(self.limits) - set(KINDS)
+        if unknown:
+            raise ValueError(f"unknown heap limits: {', '.join(sorted(unknown))}")
+
+    def __getattr__(self, kind: str) -> int:
+        try:
+            return self.counts[kind]
+        except KeyError:
+            raise AttributeError(kind) from None
+
+    def exceeded(self, kind: str, token: Token | None) -> LoxRuntimeError:
+        limit = self.limits[kind]
+        return LoxRuntimeError(f"Heap quota exceeded: more than {limit} {kind}.", token)
+
+
+HEAP: ContextVar[Heap | None] = ContextVar("HEAP", default=None)
+
+
+def allocate(kind: str, token: Token | None = None) -> None:
+    heap = HEAP.get()
+    if heap is None:
+        return
+    counts = heap.counts
+    counts[kind] += 1
+    if heap.limits and counts[kind] > heap.limits.get(kind, counts[kind]):
+        raise heap.exceeded(kind, token)
+
+
+def allocate_string(value: str, token: Token) -> str:
+    heap = HEAP.get()
+    if heap is None:
+        return value
+    counts = heap.counts
+    counts["strings"] += 1
+    counts["string_chars"] += len(value)
+    if heap.limits:
+        for kind in ("strings", "string_chars"):
+            if counts[kind] > heap.limits.get(kind, counts[kind]):
+                raise heap.exceeded(kind, token)
+    return value
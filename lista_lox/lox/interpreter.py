@@ -1,311 +1,435 @@
-from ast import For
-from functools import singledispatch
-from multiprocessing import Value
-from lox.ast import *
-from lox.eval import check_number_operands
-from lox.tokens import TokenType
-from lox.tokens import Token
-from lox.errors import LoxRuntimeError
-from lox import env
-
-class Env(env.Env[Value]):
-    pass
-
-@singledispatch
-def eval(expr: Expr, env: Env) -> Value: 
-    msg = f"cannot eval {expr.__class__.__name__} objects"
-    raise TypeError(msg)
-
-@eval.register
-def _(expr: Literal, env: Env) -> Value:
-    return expr.value
-
-@eval.register
-def _(expr: Grouping, env: Env) -> Value:
-    return eval(expr.expression, env)
-
-@eval.register
-def _(expr: Unary, env: Env) -> Value:
-    right = eval(expr.right, env)
-    match expr.operator.type :
-        case "MINUS":
-            return -as_number_operand(expr.operator, right)
-        case "BANG":
-            return not is_truthy(right)
-        case op:
-            assert False, f"unhandled operator {op}"
-
-def is_truthy(obj: Any) -> bool:
-    if obj is None or obj is False:
-        return False
-    return True
-
-@eval.register
-def _(expr: Binary, env: Env) -> Value:
-    left = eval(expr.left, env)
-    right = eval(expr.right, env)
-    match expr.operator.type:
-        case "BANG_EQUAL":
-            return not is_equal(left, right)
-        case "EQUAL_EQUAL":
-            return is_equal(left, right)
-        case "GREATER":
-            check_number_operands(expr.operator, left, right)
-            return left > right
-        case "GREATER_EQUAL":
-            check_number_operands(expr.operator, left, right)
-            return left >= right
-        case "LESS":
-            check_number_operands(expr.operator, left, right)
-            return left < right
-        case "LESS_EQUAL":
-            check_number_operands(expr.operator, left, right)
-            return left <= right
-        case "MINUS":
-            check_number_operands(expr.operator, left, right)
-            return left - right
-        case "SLASH":
-            check_number_operands(expr.operator, left, right)
-            return divide(left, right)
-        case "STAR":
-            check_number_operands(expr.operator, left, right)
-            return left * right
-        case "PLUS":
-            if isinstance(left, (float, int)) and isinstance(right, (float, int)):
-                return left + right
-            if isinstance(left, str) or isinstance(right, str):
-                return stringify(left) + stringify(right)
-            msg = "Operands must be two numbers or two strings."
-            raise LoxRuntimeError(msg, expr.operator)
-        case op:
-            assert False, f"unhandled operator {op}"
-
-def divide(left: float, right: float) -> float:
-    if right != 0:
-        return left / right
-    if left == 0:
-        return float("nan")
-    elif left > 0:
-        return float("inf")
-    else:
-        return float("-inf")
-    
-def is_equal(a, b):
-    if a is None and b is None:
-        return True
-    if a is None or b is None:
-        return False
-    if isinstance(a, bool) or isinstance(b, bool):
-        return type(a) == type(b) and a == b
-    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
-        return a == b
-    if isinstance(a, str) and isinstance(b, str):
-        return a == b
-    return a is b
-
-def as_number_operand(operator: Token, operand: Value) -> float:
-    if isinstance(operand, (float, int)):
-        return float(operand)
-    raise LoxRuntimeError("Operand must be a number.", operator)
-
-def stringify(value: Value) -> str:
-    if value is None:
-        return "nil"
-    elif isinstance(value, float):
-        return str(value).removesuffix(".0")
-    elif isinstance(value, bool):
-        return "true" if value else "false"
-    else:
-        return str(value)
-    
-@singledispatch
-def exec(stmt: Stmt, env: Env) -> None:
-    msg = f"exec not implemented for {type(stmt)}"
-    raise TypeError(msg)
-
-@exec.register
-def _(stmt: Expression, env: Env) -> None:
-    eval(stmt.expression, env)
-
-@exec.register
-def _(stmt: Print, env: Env) -> None:
-    value = eval(stmt.expression, env)
-    print(stringify(value))
-
-@exec.register
-def _(stmt: Program, env: Env) -> None:
-    for child in stmt.statements:
-        exec(child, env)
-
-@exec.register
-def _(stmt: Var, env: Env) -> None:
-    value = eval(stmt.initializer, env) if stmt.initializer is not None else None
-    env[stmt.name.lexeme] = value
-
-@eval.register
-def _(expr: Variable, env: Env) -> Value:
-    try:
-        return env[expr.name.lexeme]
-    except NameError as error:
-        msg = f"Undefined variable '{expr.name.lexeme}'."
-        raise LoxRuntimeError(msg, expr.name)
-    
-@eval.register
-def _(expr: Assign, env: Env) -> Value:
-    value = eval(expr.value, env)
-    try:
-        env.assign(expr.name.lexeme, value)
-    except NameError as error:
-        msg = f"Undefined variable '{expr.name.lexeme}'."
-        raise LoxRuntimeError(msg, expr.name)
-    return value
-
-@exec.register
-def _(stmt: Block, env: Env) -> None:
-    inner_env = env.push() 
-    for statement in stmt.statements:
-        exec(statement, inner_env)
-
-@exec.register
-def _(stmt: If, env: Env) -> None:
-    condition = eval(stmt.condition, env)
-    if is_truthy(condition):
-        exec(stmt.then_branch, env)
-    elif stmt.else_branch is not None:
-        exec(stmt.else_branch, env)
-
-@eval.register
-def _(expr: Logical, env: Env) -> Value:
-    left = eval(expr.left, env)
-    if expr.operator.type == "OR":
-        if is_truthy(left):
-            return left
-    elif expr.operator.type == "AND":
-        if not is_truthy(left):
-            return left
-    return eval(expr.right, env)
-
-@exec.register
-def _(stmt: While, env: Env) -> None:
-    while is_truthy(eval(stmt.condition, env)):
-        exec(stmt.body, env)
-
-@exec.register
-def _(stmt: For, env: Env) -> None:
-    statements = []
-    if stmt.initializer is not None:
-        statements.append(stmt.initializer)
-    while_body = [stmt.body]
-    if stmt.increment is not None:
-        while_body.append(Expression(stmt.increment))
-    if stmt.condition is None:
-        condition = Literal(True)
-    else:
-        condition = stmt.condition
-    while_stmt = While(condition, Block(while_body))
-    statements.append(while_stmt)
-    exec(Block(statements), env)
-
-class Class:
-    def __init__(self, name: str):
-        self.name = name
-        self.methods = {}
-
-    def call(self, interpreter, arguments):
-        return Instance(self)
-
-    def arity(self):
-        return 0
-
-    def __repr__(self):
-        return f"<class {self.name}>"
-    
-@exec.register
-def _(stmt: ClassStmt, env: Env) -> None:
-    klass = Class(stmt.name.lexeme)
-    env[stmt.name.lexeme] = klass
-
-@eval.register(Call)
-def _(expr: Call, env: Env):
-    callee = eval(expr.callee, env)
-    arguments = [eval(arg, env) for arg in expr.arguments]
-    if not hasattr(callee, "call"):
-        raise LoxRuntimeError(expr.paren, "Can only call functions and classes.")
-    if hasattr(callee, "arity") and len(arguments) != callee.arity():
-        raise LoxRuntimeError(
-            expr.paren,
-            f"Expected {callee.arity()} arguments but got {len(arguments)}."
-        )
-    return callee.call(interpreter=None, arguments=arguments)
-
-class Instance:
-    def __init__(self, klass):
-        self.klass = klass
-        self.fields = {}
-
-    def get(self, name: Token):
-        if name.lexeme in self.fields:
-            return self.fields[name.lexeme]
-        if name.lexeme in self.klass.methods:
-            method = self.klass.methods[name.lexeme]
-            return BoundMethod(self, method)
-        raise LoxRuntimeError(f"Undefined property '{name.lexeme}'.", name)
-
-    def __repr__(self):
-        return f"<{self.klass.name} instance>"
-
-class Function:
-    def __init__(self, declaration: FunctionStmt):
-        self.declaration = declaration
-
-    def call(self, interpreter, arguments):
-        return None
-
-class BoundMethod:
-    def __init__(self, instance, function):
-        self.instance = instance
-        self.function = function
-
-    def call(self, interpreter, arguments):
-        return self.function.call(interpreter, arguments)
-
-    def __repr__(self):
-        return f"<bound method {self.function.declaration.name.lexeme}>"
-
-@exec.register
-def _(stmt: ClassStmt, env: Env) -> None:
-    klass = Class(stmt.name.lexeme)
-    for method in stmt.methods:
-        function = Function(method)
-        klass.methods[method.name.lexeme] = function
-    env[stmt.name.lexeme] = klass
-
-@eval.register
-def _(expr: Get, env: Env):
-    obj = eval(expr.object, env)
-    if isinstance(obj, Instance):
-        return obj.get(expr.name)
-    raise LoxRuntimeError(f"Only instances have properties.", expr.name)
-
-class Function:
-    def __init__(self, declaration: FunctionStmt):
-        self.declaration = declaration
-
-    def call(self, interpreter, arguments):
-        local_env = env.Env()
-        for param, arg in zip(self.declaration.params, arguments):
-            local_env[param.lexeme] = arg
-        for statement in self.declaration.body:
-            exec(statement, local_env)
-        return None
-
-    def arity(self):
-        return len(self.declaration.params)
-
-    def __repr__(self):
-        return f"<fn {self.declaration.name.lexeme}>"
-
-@exec.register
-def _(stmt: FunctionStmt, env: Env) -> None:
-    function = Function(stmt)
-    env[stmt.name.lexeme] = function
+import asyncio
+import time
+from ast import For
+from functools import singledispatch
+from multiprocessing import Value
+from lox.ast import *
+from lox.eval import check_number_operands
+from lox.tokens import TokenType
+from lox.tokens import Token
+from lox.errors import LoxRuntimeError
+from lox import env
+from lox.modules import MODULES
+from lox.heap import allocate, allocate_string
+from lox.budget import charge
+from lox.output import OUTPUT
+from lox.memo import MEMO, MISSING, memo_key
+
+class Env(env.Env[Value]):
+    pass
+
+@singledispatch
+def eval(expr: Expr, env: Env) -> Value: 
+    msg = f"cannot eval {expr.__class__.__name__} objects"
+    raise TypeError(msg)
+
+@eval.register
+def _(expr: Literal, env: Env) -> Value:
+    return expr.value
+
+@eval.register
+def _(expr: Grouping, env: Env) -> Value:
+    return eval(expr.expression, env)
+
+@eval.register
+def _(expr: Unary, env: Env) -> Value:
+    right = eval(expr.right, env)
+    match expr.operator.type :
+        case "MINUS":
+            return -as_number_operand(expr.operator, right)
+        case "BANG":
+            return not is_truthy(right)
+        case op:
+            assert False, f"unhandled operator {op}"
+
+def is_truthy(obj: Any) -> bool:
+    if obj is None or obj is False:
+        return False
+    return True
+
+@eval.register
+def _(expr: Binary, env: Env) -> Value:
+    left = eval(expr.left, env)
+    right = eval(expr.right, env)
+    match expr.operator.type:
+        case "BANG_EQUAL":
+            return not is_equal(left, right)
+        case "EQUAL_EQUAL":
+            return is_equal(left, right)
+        case "GREATER":
+            check_number_operands(expr.operator, left, right)
+            return left > right
+        case "GREATER_EQUAL":
+            check_number_operands(expr.operator, left, right)
+            return left >= right
+        case "LESS":
+            check_number_operands(expr.operator, left, right)
+            return left < right
+        case "LESS_EQUAL":
+            check_number_operands(expr.operator, left, right)
+            return left <= right
+        case "MINUS":
+            check_number_operands(expr.operator, left, right)
+            return left - right
+        case "SLASH":
+            check_number_operands(expr.operator, left, right)
+            return divide(left, right)
+        case "STAR":
+            check_number_operands(expr.operator, left, right)
+            return left * right
+        case "PLUS":
+            if isinstance(left, (float, int)) and isinstance(right, (float, int)):
+                return left + right
+            if isinstance(left, str) or isinstance(right, str):
+                return allocate_string(stringify(left) + stringify(right), expr.operator)
+            msg = "Operands must be two numbers or two strings."
+            raise LoxRuntimeError(msg, expr.operator)
+        case op:
+            assert False, f"unhandled operator {op}"
+
+def divide(left: float, right: float) -> float:
+    if right != 0:
+        return left / right
+    if left == 0:
+        return float("nan")
+    elif left > 0:
+        return float("inf")
+    else:
+        return float("-inf")
+    
+def is_equal(a, b):
+    if a is None and b is None:
+        return True
+    if a is None or b is None:
+        return False
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) == type(b) and a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    if isinstance(a, str) and isinstance(b, str):
+        return a == b
+    return a is b
+
+def as_number_operand(operator: Token, operand: Value) -> float:
+    if isinstance(operand, (float, int)):
+        return float(operand)
+    raise LoxRuntimeError("Operand must be a number.", operator)
+
+# Printing counters is common, and a lookup beats float.__repr__ for them.
+# Zero is left out so that -0.0 still prints as "-0".
+SMALL_INTEGERS = {float(i): str(i) for i in range(-1024, 4096) if i}
+
+def stringify(value: Value) -> str:
+    if value is None:
+        return "nil"
+    elif isinstance(value, float):
+        return SMALL_INTEGERS.get(value) or str(value).removesuffix(".0")
+    elif isinstance(value, bool):
+        return "true" if value else "false"
+    else:
+        return str(value)
+    
+@singledispatch
+def exec(stmt: Stmt, env: Env) -> None:
+    msg = f"exec not implemented for {type(stmt)}"
+    raise TypeError(msg)
+
+@exec.register
+def _(stmt: Expression, env: Env) -> None:
+    eval(stmt.expression, env)
+
+@exec.register
+def _(stmt: Print, env: Env) -> None:
+    value = eval(stmt.expression, env)
+    OUTPUT.get().write_line(stringify(value))
+
+@exec.register
+def _(stmt: Program, env: Env) -> None:
+    for child in stmt.statements:
+        exec(child, env)
+
+@exec.register
+def _(stmt: Var, env: Env) -> None:
+    value = eval(stmt.initializer, env) if stmt.initializer is not None else None
+    env[stmt.name.lexeme] = value
+
+@eval.register
+def _(expr: Variable, env: Env) -> Value:
+    try:
+        return env[expr.name.lexeme]
+    except NameError as error:
+        msg = f"Undefined variable '{expr.name.lexeme}'."
+        raise LoxRuntimeError(msg, expr.name)
+    
+@eval.register
+def _(expr: Assign, env: Env) -> Value:
+    value = eval(expr.value, env)
+    try:
+        env.assign(expr.name.lexeme, value)
+    except NameError as error:
+        msg = f"Undefined variable '{expr.name.lexeme}'."
+        raise LoxRuntimeError(msg, expr.name)
+    return value
+
+@exec.register
+def _(stmt: Block, env: Env) -> None:
+    match stmt.scope:
+        case "none":
+            for statement in stmt.statements:
+                exec(statement, env)
+        case "reuse":
+            if env.spare is None:
+                allocate("scopes")
+            inner_env = env.scratch()
+            try:
+                for statement in stmt.statements:
+                    exec(statement, inner_env)
+            finally:
+                inner_env.values.clear()
+        case _:
+            allocate("scopes")
+            inner_env = env.push()
+            for statement in stmt.statements:
+                exec(statement, inner_env)
+
+@exec.register
+def _(stmt: Import, env: Env) -> None:
+    # Modules run once per global environment, into that environment.
+    root = env.root()
+    if root.modules is None:
+        root.modules = set()
+    if stmt.resolved in root.modules:
+        return
+    root.modules.add(stmt.resolved)
+    exec(MODULES.load(stmt.resolved).program, root)
+
+@exec.register
+def _(stmt: If, env: Env) -> None:
+    condition = eval(stmt.condition, env)
+    if is_truthy(condition):
+        exec(stmt.then_branch, env)
+    elif stmt.else_branch is not None:
+        exec(stmt.else_branch, env)
+
+@eval.register
+def _(expr: Logical, env: Env) -> Value:
+    left = eval(expr.left, env)
+    if expr.operator.type == "OR":
+        if is_truthy(left):
+            return left
+    elif expr.operator.type == "AND":
+        if not is_truthy(left):
+            return left
+    return eval(expr.right, env)
+
+@exec.register
+def _(stmt: While, env: Env) -> None:
+    while is_truthy(eval(stmt.condition, env)):
+        exec(stmt.body, env)
+        charge()
+
+@exec.register
+def _(stmt: For, env: Env) -> None:
+    statements = []
+    if stmt.initializer is not None:
+        statements.append(stmt.initializer)
+    while_body = [stmt.body]
+    if stmt.increment is not None:
+        while_body.append(Expression(stmt.increment))
+    if stmt.condition is None:
+        condition = Literal(True)
+    else:
+        condition = stmt.condition
+    while_stmt = While(condition, Block(while_body))
+    statements.append(while_stmt)
+    exec(Block(statements), env)
+
+class Class:
+    def __init__(self, name: str):
+        self.name = name
+        self.methods = {}
+
+    def call(self, interpreter, arguments):
+        allocate("instances")
+        return Instance(self)
+
+    def arity(self):
+        return 0
+
+    def __repr__(self):
+        return f"<class {self.name}>"
+    
+@exec.register
+def _(stmt: ClassStmt, env: Env) -> None:
+    klass = Class(stmt.name.lexeme)
+    env[stmt.name.lexeme] = klass
+
+@eval.register(Call)
+def _(expr: Call, env: Env):
+    callee = eval(expr.callee, env)
+    arguments = [eval(arg, env) for arg in expr.arguments]
+    if not hasattr(callee, "call"):
+        raise LoxRuntimeError(expr.paren, "Can only call functions and classes.")
+    if hasattr(callee, "arity") and len(arguments) != callee.arity():
+        raise LoxRuntimeError(
+            expr.paren,
+            f"Expected {callee.arity()} arguments but got {len(arguments)}."
+        )
+    return callee.call(interpreter=None, arguments=arguments)
+
+class Instance:
+    def __init__(self, klass):
+        self.klass = klass
+        self.fields = {}
+
+    def get(self, name: Token):
+        if name.lexeme in self.fields:
+            return self.fields[name.lexeme]
+        if name.lexeme in self.klass.methods:
+            method = self.klass.methods[name.lexeme]
+            return BoundMethod(self, method)
+        raise LoxRuntimeError(f"Undefined property '{name.lexeme}'.", name)
+
+    def __repr__(self):
+        return f"<{self.klass.name} instance>"
+
+class Function:
+    def __init__(self, declaration: FunctionStmt):
+        self.declaration = declaration
+
+    def call(self, interpreter, arguments):
+        return None
+
+class BoundMethod:
+    def __init__(self, instance, function):
+        self.instance = instance
+        self.function = function
+
+    def call(self, interpreter, arguments):
+        return self.function.call(interpreter, arguments)
+
+    def __repr__(self):
+        return f"<bound method {self.function.declaration.name.lexeme}>"
+
+@exec.register
+def _(stmt: ClassStmt, env: Env) -> None:
+    klass = Class(stmt.name.lexeme)
+    for method in stmt.methods:
+        allocate("functions", method.name)
+        function = Function(method, env)
+        klass.methods[method.name.lexeme] = function
+    env[stmt.name.lexeme] = klass
+
+@eval.register
+def _(expr: Get, env: Env):
+    obj = eval(expr.object, env)
+    if isinstance(obj, Instance):
+        return obj.get(expr.name)
+    raise LoxRuntimeError(f"Only instances have properties.", expr.name)
+
+class ReturnValue(Exception):
+    def __init__(self, value: Value):
+        super().__init__()
+        self.value = value
+
+@exec.register
+def _(stmt: Return, env: Env) -> None:
+    value = eval(stmt.value, env) if stmt.value is not None else None
+    raise ReturnValue(value)
+
+class Function:
+    def __init__(self, declaration: FunctionStmt, closure: Env | None = None):
+        self.declaration = declaration
+        self.closure = closure
+
+    def call(self, interpreter, arguments):
+        charge(self.declaration.name)
+        allocate("scopes", self.declaration.name)
+        local_env = env.Env(enclosing=self.closure)
+        for param, arg in zip(self.declaration.params, arguments):
+            local_env[param.lexeme] = arg
+        try:
+            for statement in self.declaration.body:
+                exec(statement, local_env)
+        except ReturnValue as result:
+            return result.value
+        return None
+
+    def arity(self):
+        return len(self.declaration.params)
+
+    def __repr__(self):
+        return f"<fn {self.declaration.name.lexeme}>"
+
+class MemoizedFunction(Function):
+    def __init__(self, declaration: FunctionStmt, closure: Env | None, table):
+        super().__init__(declaration, closure)
+        self.table = table
+
+    def call(self, interpreter, arguments):
+        key = memo_key(arguments)
+        if key is None:
+            self.table.uncached += 1
+            return super().call(interpreter, arguments)
+        value = self.table.get(key)
+        if value is MISSING:
+            value = super().call(interpreter, arguments)
+            self.table.put(key, value)
+        else:
+            charge(self.declaration.name)
+        return value
+
+class NativeFunction:
+    def __init__(self, name: str, arity: int, function, coroutine=None):
+        self.name = name
+        self.function = function
+        # Used instead of function when the program runs as an asyncio task.
+        self.coroutine = coroutine
+        self._arity = arity
+
+    def call(self, interpreter, arguments):
+        return self.function(*arguments)
+
+    def arity(self):
+        return self._arity
+
+    def __repr__(self):
+        return "<native fn>"
+
+def as_seconds(value: Value) -> float:
+    if isinstance(value, float) and value >= 0:
+        return value
+    raise LoxRuntimeError("Argument to 'sleep' must be a non-negative number.")
+
+def sleep(seconds: Value) -> None:
+    time.sleep(as_seconds(seconds))
+
+async def sleep_async(seconds: Value) -> None:
+    await asyncio.sleep(as_seconds(seconds))
+
+def read_file(path: Value) -> str:
+    if not isinstance(path, str):
+        raise LoxRuntimeError("Argument to 'readFile' must be a string.")
+    try:
+        with open(path, encoding="utf-8") as file:
+            return allocate_string(file.read(), None)
+    except (OSError, UnicodeDecodeError):
+        raise LoxRuntimeError(f"Could not read file '{path}'.") from None
+
+async def read_file_async(path: Value) -> str:
+    return await asyncio.to_thread(read_file, path)
+
+def define_natives(env: Env) -> None:
+    env["clock"] = NativeFunction("clock", 0, time.time)
+    env["sleep"] = NativeFunction("sleep", 1, sleep, sleep_async)
+    env["readFile"] = NativeFunction("readFile", 1, read_file, read_file_async)
+
+@exec.register
+def _(stmt: FunctionStmt, env: Env) -> None:
+    allocate("functions", stmt.name)
+    memo = MEMO.get() if stmt.pure else None
+    if memo is None:
+        function = Function(stmt, env)
+    else:
+        function = MemoizedFunction(stmt, env, memo.table(stmt))
+    env[stmt.name.lexeme] = function
@@ -0,0 +1,74 @@
+"""Caching the results of pure functions.
+
+When a run has a Memo made current, functions marked pure by lox.purity
+are created as MemoizedFunction objects that keep a bounded LRU table of
+results per declaration. Only calls whose arguments are all strings or
+numbers other than -0 and NaN are cached, so that keys compare the way
+Lox values do.
+"""
+import math
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_SIZE = 1024
+MISSING = object()
+
+
+@dataclass
+class MemoTable:
+    name: str
+    maxsize: int = DEFAULT_SIZE
+    entries: OrderedDict = field(default_factory=OrderedDict, repr=False)
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    uncached: int = 0
+
+    def get(self, key: tuple) -> Any:
+        value = self.entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple, value: Any) -> None:
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+class Memo:
+    def __init__(self, maxsize: int = DEFAULT_SIZE):
+        self.maxsize = maxsize
+        self.tables: dict[int, MemoTable] = {}
+
+    def table(self, declaration) -> MemoTable:
+        table = self.tables.get(id(declaration))
+        if table is None:
+            table = self.tables[id(declaration)] = MemoTable(declaration.name.lexeme, self.maxsize)
+        return table
+
+    def report(self) -> str:
+        return "\n".join(
+            f"memo {t.name}: {t.hits} hits, {t.misses} misses, "
+            f"{t.evictions} evictions, {t.uncached} uncached calls"
+            for t in self.tables.values()
+        )
+
+
+MEMO: ContextVar[Memo | None] = ContextVar("MEMO", default=None)
+
+
+def memo_key(arguments: list[Any]) -> tuple | None:
+    for argument in arguments:
+        if type(argument) is float:
+            if argument != argument or (argument == 0 and math.copysign(1.0, argument) < 0):
+                return None
+        elif type(argument) is not str:
+            return None
+    return tuple(arguments)
@@ -0,0 +1,136 @@
+"""Loading of ``import "path.lox";`` modules.
+
+Modules are parsed and analyzed at most once per process: the process-wide
+MODULES cache keys them by absolute path and revalidates them with the
+file's mtime and size. With a cache directory set, the analyzed AST is also
+pickled there, keyed by a hash of path and content, so later runs can skip
+the front end entirely.
+"""
+import hashlib
+import os
+import pickle
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+from lox.ast import *
+from lox.errors import LoxStaticError, LoxSyntaxError
+from lox.parser import parse
+from lox.scanner import tokenize
+from lox.scopes import analyze_scopes
+
+CACHE_FORMAT = 3
+
+
+@dataclass
+class Module:
+    path: str
+    stamp: tuple[int, int]
+    program: Program
+    imports: list[Import] = field(default_factory=list)
+
+
+def find_imports(statements: list[Stmt]) -> Iterator[Import]:
+    for stmt in statements:
+        match stmt:
+            case Import():
+                yield stmt
+            case Program(statements=body) | Block(statements=body) | FunctionStmt(body=body):
+                yield from find_imports(body)
+            case If():
+                yield from find_imports([stmt.then_branch])
+                if stmt.else_branch is not None:
+                    yield from find_imports([stmt.else_branch])
+            case While():
+                yield from find_imports([stmt.body])
+            case ClassStmt():
+                yield from find_imports(stmt.methods)
+
+
+def import_error(stmt: Import, message: str) -> LoxStaticError:
+    error = LoxSyntaxError(f"[line {stmt.path.line}] Error at {stmt.path.lexeme}: {message}", stmt.path)
+    return LoxStaticError([error])
+
+
+class ModuleCache:
+    def __init__(self, cache_dir: str | None = None):
+        self.cache_dir = cache_dir
+        self.modules: dict[str, Module] = {}
+        self.loads = 0
+        self.lock = threading.RLock()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.modules.clear()
+
+    def resolve(self, program: Program, base_dir: str, stack: tuple[str, ...] = ()) -> list[Import]:
+        """Fill in Import.resolved under program and load every module it imports"""
+        imports = list(find_imports(program.statements))
+        for stmt in imports:
+            stmt.resolved = os.path.abspath(os.path.join(base_dir, stmt.path.literal))
+            self.enter(stmt, stack)
+        return imports
+
+    def enter(self, stmt: Import, stack: tuple[str, ...]) -> Module:
+        path = stmt.resolved
+        if path in stack:
+            chain = " -> ".join(os.path.basename(p) for p in (*stack, path))
+            raise import_error(stmt, f"Import cycle {chain}.")
+        if not os.path.isfile(path):
+            raise import_error(stmt, "Module not found.")
+        return self.load(path, stack)
+
+    def load(self, path: str, stack: tuple[str, ...] = ()) -> Module:
+        with self.lock:
+            stat = os.stat(path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            module = self.modules.get(path)
+            if module is None or module.stamp != stamp:
+                module = self._load(path, stamp, stack)
+                self.modules[path] = module
+            else:
+                # Dependencies may have changed since, so they are revisited
+                # to pick up edits and report new cycles.
+                for stmt in module.imports:
+                    self.enter(stmt, (*stack, path))
+            return module
+
+    def _load(self, path: str, stamp: tuple[int, int], stack: tuple[str, ...]) -> Module:
+        source = Path(path).read_bytes()
+        program = self._read_disk_cache(path, source)
+        if program is None:
+            program = parse(tokenize(source.decode("utf-8")))
+            analyze_scopes(program)
+            self.loads += 1
+        imports = self.resolve(program, os.path.dirname(path), (*stack, path))
+        self._write_disk_cache(path, source, program)
+        return Module(path, stamp, program, imports)
+
+    def _disk_path(self, path: str, source: bytes) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256(f"{CACHE_FORMAT}:{path}:".encode() + source).hexdigest()
+        return Path(self.cache_dir) / f"{digest}.loxc"
+
+    def _read_disk_cache(self, path: str, source: bytes) -> Program | None:
+        cached = self._disk_path(path, source)
+        if cached is None or not cached.exists():
+            return None
+        try:
+            with open(cached, "rb") as file:
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def _write_disk_cache(self, path: str, source: bytes, program: Program) -> None:
+        cached = self._disk_path(path, source)
+        if cached is None or cached.exists():
+            return
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        partial = cached.with_suffix(f".{os.getpid()}.tmp")
+        with open(partial, "wb") as file:
+            pickle.dump(program, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, cached)
+
+
+MODULES = ModuleCache()
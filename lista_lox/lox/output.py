@@ -0,0 +1,79 @@
+"""Where ``print`` statements write.
+
+Each run writes through an Output made current with a context variable.
+The default buffers whole lines and writes them to sys.stdout in blocks,
+flushing when the buffer fills up and at the end of the run.
+"""
+import sys
+from contextvars import ContextVar
+from typing import Any, Callable, TextIO
+
+BUFFER_SIZE = 8192
+
+
+class Output:
+    def write_line(self, text: str) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+
+class StreamOutput(Output):
+    def __init__(self, stream: TextIO | None = None, buffer_size: int = BUFFER_SIZE):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.parts: list[str] = []
+        self.size = 0
+
+    def write_line(self, text: str) -> None:
+        self.parts.append(text)
+        self.parts.append("\n")
+        self.size += len(text) + 1
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.parts:
+            return
+        # sys.stdout is looked up late so redirect_stdout() keeps working.
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("".join(self.parts))
+        stream.flush()
+        self.parts.clear()
+        self.size = 0
+
+
+class ListOutput(Output):
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+
+    def write_line(self, text: str) -> None:
+        self.lines.append(text)
+
+
+class CallbackOutput(Output):
+    def __init__(self, callback: Callable[[str], Any]):
+        self.callback = callback
+
+    def write_line(self, text: str) -> None:
+        self.callback(text)
+
+
+def make_output(sink: Any = None) -> Output:
+    """Wrap a file-like object, list of lines or callback as an Output"""
+    if sink is None:
+        return StreamOutput()
+    if isinstance(sink, Output):
+        return sink
+    if hasattr(sink, "write"):
+        return StreamOutput(sink)
+    if isinstance(sink, list):
+        return ListOutput(sink)
+    if callable(sink):
+        return CallbackOutput(sink)
+    raise TypeError(f"cannot write Lox output to {type(sink).__name__} objects")
+
+
+# Outside of Lox.run (e.g. calling exec directly) print() behaves as before.
+OUTPUT: ContextVar[Output] = ContextVar("OUTPUT", default=CallbackOutput(print))
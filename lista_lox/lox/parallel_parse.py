@@ -0,0 +1,90 @@
+"""Parse huge programs by splitting them at top-level declarations.
+
+A cheap pre-scan over the token stream tracks brace and parenthesis depth
+and cuts before every top-level ``class``, ``fun`` or ``var`` that follows
+a ``;`` or ``}``. At such a point the serial parser has always finished
+the previous declaration (or its error recovery stops there), so parsing
+the chunks independently and concatenating the results gives the same
+Program and the same errors, in the same order.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from lox.ast import Program, Stmt
+from lox.errors import LoxStaticError, LoxSyntaxError
+from lox.parser import Parser, parse, parse_declarations
+from lox.tokens import Token, TokenType
+
+DECLARATIONS = {TokenType.CLASS, TokenType.FUN, TokenType.VAR}
+DECLARATION_ENDS = {TokenType.SEMICOLON, TokenType.RIGHT_BRACE}
+MIN_PARALLEL_TOKENS = 50_000
+
+
+def split_points(tokens: list[Token]) -> list[int] | None:
+    """Indices of top-level declarations, or None if braces do not balance"""
+    points = []
+    braces = parens = 0
+    previous = TokenType.SEMICOLON
+    for i, token in enumerate(tokens):
+        kind = token.type
+        if kind == TokenType.LEFT_BRACE:
+            braces += 1
+        elif kind == TokenType.RIGHT_BRACE:
+            braces -= 1
+        elif kind == TokenType.LEFT_PAREN:
+            parens += 1
+        elif kind == TokenType.RIGHT_PAREN:
+            parens -= 1
+        elif kind in DECLARATIONS and braces == 0 and parens == 0 and previous in DECLARATION_ENDS:
+            points.append(i)
+        if braces < 0:
+            return None
+        previous = kind
+    if braces != 0:
+        return None
+    return points
+
+
+def chunk_tokens(tokens: list[Token], chunks: int) -> list[list[Token]]:
+    """Cut tokens into at most `chunks` pieces of similar size"""
+    points = split_points(tokens)
+    if not points or chunks <= 1:
+        return [tokens]
+    target = len(tokens) / chunks
+    cuts = [0]
+    for point in points:
+        if point - cuts[-1] >= target:
+            cuts.append(point)
+    cuts.append(len(tokens))
+    return [tokens[start:end] for start, end in zip(cuts, cuts[1:]) if start < end]
+
+
+def parse_chunk(tokens: list[Token]) -> tuple[list[Stmt], list[LoxSyntaxError]]:
+    if tokens[-1].type != TokenType.EOF:
+        tokens = tokens + [Token(TokenType.EOF, "", None, tokens[-1].line)]
+    parser = Parser(tokens)
+    statements = parse_declarations(parser)
+    return statements, parser.errors
+
+
+def parse_parallel(tokens: list[Token], workers: int | None = None,
+                   min_tokens: int = MIN_PARALLEL_TOKENS) -> Program:
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tokens) < min_tokens:
+        return parse(tokens)
+
+    # Parser reports invalid tokens up front and drops them; do that once
+    # here so every chunk only sees syntax errors.
+    prescan = Parser(tokens)
+    errors = list(prescan.errors)
+    chunks = chunk_tokens(prescan.tokens, workers * 4)
+    if len(chunks) == 1:
+        return parse(tokens)
+
+    statements: list[Stmt] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_statements, chunk_errors in executor.map(parse_chunk, chunks):
+            statements.extend(chunk_statements)
+            errors.extend(chunk_errors)
+    if errors:
+        raise LoxStaticError(errors)
+    return Program(statements)
@@ -0,0 +1,84 @@
+"""Programs that went through the front end once and can be run many times."""
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+from lox.ast import Program
+from lox.budget import BUDGET, Budget
+from lox.engines import Engine
+from lox.errors import LoxRuntimeError
+from lox.heap import HEAP, Heap
+from lox.interpreter import Env, define_natives
+from lox.memo import MEMO, Memo
+from lox.output import OUTPUT, Output, ListOutput
+
+
+@contextmanager
+def run_context(output: Output, heap: Heap, budget: Budget, memo: Memo | None = None):
+    """Make output, heap, budget and memo current for the duration of a run"""
+    memo_token = MEMO.set(memo)
+    heap_token = HEAP.set(heap)
+    budget_token = BUDGET.set(budget)
+    output_token = OUTPUT.set(output)
+    try:
+        yield
+    finally:
+        output.flush()
+        OUTPUT.reset(output_token)
+        BUDGET.reset(budget_token)
+        HEAP.reset(heap_token)
+        MEMO.reset(memo_token)
+
+
+def new_env() -> Env:
+    env = Env()
+    define_natives(env)
+    return env
+
+
+def as_lox_value(value: Any) -> Any:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+@dataclass(frozen=True)
+class RunResult:
+    output: list[str]
+    error: LoxRuntimeError | None
+    seconds: float
+    heap: Heap
+    fuel_used: int
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class PreparedProgram:
+    program: Program
+    engine: Engine
+    path: str | None = None
+    prepare_seconds: float = field(default=0.0, compare=False)
+
+    def run(self, bindings: dict[str, Any] | None = None, env: Env | None = None, *,
+            fuel: int | None = None, timeout: float | None = None,
+            heap_limits: dict[str, int] | None = None) -> RunResult:
+        """Run in env (a fresh global environment by default) with bindings defined"""
+        if env is None:
+            env = new_env()
+        for name, value in (bindings or {}).items():
+            env[name] = as_lox_value(value)
+        lines: list[str] = []
+        heap = Heap(dict(heap_limits or {}))
+        budget = Budget(fuel, timeout)
+        error = None
+        start = time.perf_counter()
+        with run_context(ListOutput(lines), heap, budget):
+            try:
+                self.engine.execute(self.program, env)
+            except LoxRuntimeError as e:
+                error = e
+        seconds = time.perf_counter() - start
+        return RunResult(lines, error, seconds, heap, budget.used)
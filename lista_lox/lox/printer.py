@@ -36,8 +36,8 @@ def parenthesize(name: str, *exprs: Expr) -> str:
     return "(" + " ".join(parts) + ")"
 
 def main():
-    minus = Token("MINUS", "-", 1)
-    star = Token("STAR", "*", 1)
+    minus = Token(TT.MINUS, "-", None, 1)
+    star = Token(TT.STAR, "*", None, 1)
     expr = Binary(
         Unary(minus, Literal(123)),
         star,
@@ -0,0 +1,190 @@
+"""Purity analysis for top-level functions.
+
+A function is pure when its result depends only on its arguments: its body
+reads nothing but its parameters and its own locals, assigns only to
+those, does not print, import, read properties, or declare functions or
+classes, and only calls top-level functions that are pure themselves.
+Functions are called by name, so a callee only counts if its name is bound
+exactly once, by its declaration, in the program and the modules it
+imports.
+
+Pure declarations get FunctionStmt.pure set, which lox.memo uses to cache
+their results.
+"""
+from collections import Counter
+from dataclasses import fields
+from functools import singledispatch
+from lox.ast import *
+from lox.modules import MODULES, find_imports
+
+
+class Impure(Exception):
+    """Raised when a function body does something a pure function cannot"""
+
+
+class Scope:
+    def __init__(self, params: list[str]):
+        self.blocks: list[set[str]] = [set(params)]
+        self.calls: set[str] = set()
+
+    def is_local(self, name: str) -> bool:
+        return any(name in block for block in self.blocks)
+
+
+def analyze_purity(program: Program) -> set[str]:
+    """Mark the pure top-level functions of program and return their names"""
+    functions = {stmt.name.lexeme: stmt for stmt in program.statements if isinstance(stmt, FunctionStmt)}
+    bindings = count_bindings(program, set())
+    calls: dict[str, set[str]] = {}
+    for name, stmt in functions.items():
+        if bindings[name] != 1:
+            continue
+        try:
+            calls[name] = function_calls(stmt)
+        except Impure:
+            pass
+    # Drop functions calling anything impure until nothing changes.
+    pure = set(calls)
+    changed = True
+    while changed:
+        changed = False
+        for name in list(pure):
+            if not calls[name] <= pure:
+                pure.discard(name)
+                changed = True
+    for name, stmt in functions.items():
+        stmt.pure = name in pure
+    return pure
+
+
+def count_bindings(program: Program, seen: set[str]) -> Counter:
+    """How often each global name is declared or assigned to"""
+    bindings: Counter = Counter()
+    for stmt in program.statements:
+        if isinstance(stmt, (Var, FunctionStmt, ClassStmt)):
+            bindings[stmt.name.lexeme] += 1
+    for name in assigned_names(program):
+        bindings[name] += 1
+    for stmt in find_imports(program.statements):
+        if stmt.resolved is not None and stmt.resolved not in seen:
+            seen.add(stmt.resolved)
+            bindings += count_bindings(MODULES.load(stmt.resolved).program, seen)
+    return bindings
+
+
+def assigned_names(node) -> set[str]:
+    names = set()
+    match node:
+        case Assign():
+            names.add(node.name.lexeme)
+            names |= assigned_names(node.value)
+        case list():
+            for child in node:
+                names |= assigned_names(child)
+        case Expr() | Stmt():
+            for field in fields(node):
+                names |= assigned_names(getattr(node, field.name))
+    return names
+
+
+def function_calls(stmt: FunctionStmt) -> set[str]:
+    """Top-level functions a pure-looking body calls; raises Impure otherwise"""
+    scope = Scope([param.lexeme for param in stmt.params])
+    for child in stmt.body:
+        check_stmt(child, scope)
+    return scope.calls
+
+
+@singledispatch
+def check_stmt(stmt: Stmt, scope: Scope) -> None:
+    raise Impure(stmt.__class__.__name__)
+
+
+@check_stmt.register
+def _(stmt: Expression, scope: Scope) -> None:
+    check_expr(stmt.expression, scope)
+
+
+@check_stmt.register
+def _(stmt: Var, scope: Scope) -> None:
+    if stmt.initializer is not None:
+        check_expr(stmt.initializer, scope)
+    scope.blocks[-1].add(stmt.name.lexeme)
+
+
+@check_stmt.register
+def _(stmt: Block, scope: Scope) -> None:
+    scope.blocks.append(set())
+    for child in stmt.statements:
+        check_stmt(child, scope)
+    scope.blocks.pop()
+
+
+@check_stmt.register
+def _(stmt: If, scope: Scope) -> None:
+    check_expr(stmt.condition, scope)
+    check_stmt(stmt.then_branch, scope)
+    if stmt.else_branch is not None:
+        check_stmt(stmt.else_branch, scope)
+
+
+@check_stmt.register
+def _(stmt: While, scope: Scope) -> None:
+    check_expr(stmt.condition, scope)
+    check_stmt(stmt.body, scope)
+
+
+@check_stmt.register
+def _(stmt: Return, scope: Scope) -> None:
+    if stmt.value is not None:
+        check_expr(stmt.value, scope)
+
+
+@singledispatch
+def check_expr(expr: Expr, scope: Scope) -> None:
+    raise Impure(expr.__class__.__name__)
+
+
+@check_expr.register
+def _(expr: Literal, scope: Scope) -> None:
+    pass
+
+
+@check_expr.register
+def _(expr: Variable, scope: Scope) -> None:
+    if not scope.is_local(expr.name.lexeme):
+        raise Impure(f"reads non-local '{expr.name.lexeme}'")
+
+
+@check_expr.register
+def _(expr: Assign, scope: Scope) -> None:
+    if not scope.is_local(expr.name.lexeme):
+        raise Impure(f"assigns non-local '{expr.name.lexeme}'")
+    check_expr(expr.value, scope)
+
+
+@check_expr.register(Binary)
+@check_expr.register(Logical)
+def _(expr: Binary | Logical, scope: Scope) -> None:
+    check_expr(expr.left, scope)
+    check_expr(expr.right, scope)
+
+
+@check_expr.register
+def _(expr: Unary, scope: Scope) -> None:
+    check_expr(expr.right, scope)
+
+
+@check_expr.register
+def _(expr: Grouping, scope: Scope) -> None:
+    check_expr(expr.expression, scope)
+
+
+@check_expr.register
+def _(expr: Call, scope: Scope) -> None:
+    callee = expr.callee
+    if not isinstance(callee, Variable) or scope.is_local(callee.name.lexeme):
+        raise Impure("calls something other than a top-level function")
+    scope.calls.add(callee.name.lexeme)
+    for argument in expr.arguments:
+        check_expr(argument, scope)
@@ -0,0 +1,61 @@
+"""Escape analysis for block scopes.
+
+A block scope can only outlive its block if a closure captures it, and in
+Lox closures are only created by ``fun`` and ``class`` declarations. Blocks
+with no such declaration anywhere inside them can run in a scratch scope
+that their enclosing scope keeps around, and blocks that declare no names
+need no scope at all.
+"""
+from functools import singledispatch
+from lox.ast import *
+
+
+@singledispatch
+def analyze_scopes(stmt: Stmt) -> bool:
+    """Mark every Block under stmt and return True if stmt may create a closure"""
+    return False
+
+
+@analyze_scopes.register
+def _(stmt: Program) -> bool:
+    return any([analyze_scopes(child) for child in stmt.statements])
+
+
+@analyze_scopes.register
+def _(stmt: Block) -> bool:
+    captures = any([analyze_scopes(child) for child in stmt.statements])
+    declares = any(isinstance(child, (Var, FunctionStmt, ClassStmt)) for child in stmt.statements)
+    if not declares:
+        stmt.scope = "none"
+    elif captures:
+        stmt.scope = "fresh"
+    else:
+        stmt.scope = "reuse"
+    return captures
+
+
+@analyze_scopes.register
+def _(stmt: If) -> bool:
+    captures = analyze_scopes(stmt.then_branch)
+    if stmt.else_branch is not None:
+        captures = analyze_scopes(stmt.else_branch) or captures
+    return captures
+
+
+@analyze_scopes.register
+def _(stmt: While) -> bool:
+    return analyze_scopes(stmt.body)
+
+
+@analyze_scopes.register
+def _(stmt: FunctionStmt) -> bool:
+    for child in stmt.body:
+        analyze_scopes(child)
+    return True
+
+
+@analyze_scopes.register
+def _(stmt: ClassStmt) -> bool:
+    for method in stmt.methods:
+        analyze_scopes(method)
+    return True
@@ -1,66 +1,67 @@
-from enum import Enum, auto
-from dataclasses import dataclass
-from typing import Any
-
-
-class TokenType(str, Enum):
-    # Single-character tokens.
-    LEFT_PAREN = "LEFT_PAREN"
-    RIGHT_PAREN = "RIGHT_PAREN"
-    LEFT_BRACE = "LEFT_BRACE"
-    RIGHT_BRACE = "RIGHT_BRACE"
-    COMMA = "COMMA"
-    DOT = "DOT"
-    MINUS = "MINUS"
-    PLUS = "PLUS"
-    SEMICOLON = "SEMICOLON"
-    SLASH = "SLASH"
-    STAR = "STAR"
-
-    # One or two character tokens.
-    BANG = "BANG"
-    BANG_EQUAL = "BANG_EQUAL"
-    EQUAL = "EQUAL"
-    EQUAL_EQUAL = "EQUAL_EQUAL"
-    GREATER = "GREATER"
-    GREATER_EQUAL = "GREATER_EQUAL"
-    LESS = "LESS"
-    LESS_EQUAL = "LESS_EQUAL"
-
-    # Literals.
-    IDENTIFIER = "IDENTIFIER"
-    STRING = "STRING"
-    NUMBER = "NUMBER"
-
-    # Keywords.
-    AND = "AND"
-    CLASS = "CLASS"
-    ELSE = "ELSE"
-    FALSE = "FALSE"
-    FUN = "FUN"
-    FOR = "FOR"
-    IF = "IF"
-    NIL = "NIL"
-    OR = "OR"
-    PRINT = "PRINT"
-    RETURN = "RETURN"
-    SUPER = "SUPER"
-    THIS = "THIS"
-    TRUE = "TRUE"
-    VAR = "VAR"
-    WHILE = "WHILE"
-
-    # Special tokens.
-    EOF = "EOF"
-    INVALID = "INVALID"
-
-
-@dataclass
-class Token:
-    type: TokenType
-    lexeme: str
-    literal: Any
-    line: int
-
-    def __str__(self) -> str:
-        return f"{self.type} {self.lexeme} {self.literal!r}"
+from enum import Enum, auto
+from dataclasses import dataclass
+from typing import Any
+
+
+class TokenType(str, Enum):
+    # Single-character tokens.
+    LEFT_PAREN = "LEFT_PAREN"
+    RIGHT_PAREN = "RIGHT_PAREN"
+    LEFT_BRACE = "LEFT_BRACE"
+    RIGHT_BRACE = "RIGHT_BRACE"
+    COMMA = "COMMA"
+    DOT = "DOT"
+    MINUS = "MINUS"
+    PLUS = "PLUS"
+    SEMICOLON = "SEMICOLON"
+    SLASH = "SLASH"
+    STAR = "STAR"
+
+    # One or two character tokens.
+    BANG = "BANG"
+    BANG_EQUAL = "BANG_EQUAL"
+    EQUAL = "EQUAL"
+    EQUAL_EQUAL = "EQUAL_EQUAL"
+    GREATER = "GREATER"
+    GREATER_EQUAL = "GREATER_EQUAL"
+    LESS = "LESS"
+    LESS_EQUAL = "LESS_EQUAL"
+
+    # Literals.
+    IDENTIFIER = "IDENTIFIER"
+    STRING = "STRING"
+    NUMBER = "NUMBER"
+
+    # Keywords.
+    AND = "AND"
+    CLASS = "CLASS"
+    ELSE = "ELSE"
+    FALSE = "FALSE"
+    FUN = "FUN"
+    FOR = "FOR"
+    IF = "IF"
+    IMPORT = "IMPORT"
+    NIL = "NIL"
+    OR = "OR"
+    PRINT = "PRINT"
+    RETURN = "RETURN"
+    SUPER = "SUPER"
+    THIS = "THIS"
+    TRUE = "TRUE"
+    VAR = "VAR"
+    WHILE = "WHILE"
+
+    # Special tokens.
+    EOF = "EOF"
+    INVALID = "INVALID"
+
+
+@dataclass(slots=True)
+class Token:
+    type: TokenType
+    lexeme: str
+    literal: Any
+    line: int
+
+    def __str__(self) -> str:
+        return f"{self.type} {self.lexeme} {self.literal!r}"
@@ -0,0 +1,276 @@
+from dataclasses import dataclass, field
+from functools import singledispatch
+from typing import Any, Callable, Sequence
+from lox.ast import *
+from lox.interpreter import Function
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUM = "num"
+BOOL = "bool"
+
+
+class NotVectorizable(Exception):
+    """Raised when a function body uses something outside the numeric subset"""
+
+
+@dataclass
+class Vectorized:
+    function: Function
+    kernel: Callable | None = None
+    reason: str | None = None
+
+    @property
+    def compiled(self) -> bool:
+        return self.kernel is not None
+
+    def __call__(self, *columns: Sequence[float]) -> Any:
+        if len(columns) != self.function.arity():
+            msg = f"Expected {self.function.arity()} columns but got {len(columns)}."
+            raise TypeError(msg)
+        if self.kernel is not None:
+            arrays = [np.asarray(column, dtype=float) for column in columns]
+            arrays = np.broadcast_arrays(*arrays) if arrays else arrays
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return self.kernel(*arrays)
+        rows = zip(*(_scalars(column) for column in columns))
+        return [self.function.call(None, list(row)) for row in rows]
+
+
+def _scalars(column: Sequence[float]) -> list[float]:
+    if hasattr(column, "tolist"):
+        column = column.tolist()
+    return [float(value) for value in column]
+
+
+def vectorize(function: Function) -> Vectorized:
+    if np is None:
+        return Vectorized(function, reason="numpy is not installed")
+    try:
+        kernel = compile_function(function.declaration)
+    except NotVectorizable as error:
+        return Vectorized(function, reason=str(error))
+    return Vectorized(function, kernel)
+
+
+@dataclass
+class Column:
+    type: str
+    value: Callable
+
+
+@dataclass
+class Scope:
+    params: dict[str, int]
+    returns: set[str] = field(default_factory=set)
+
+
+def compile_function(declaration: FunctionStmt) -> Callable:
+    scope = Scope({param.lexeme: i for i, param in enumerate(declaration.params)})
+    body = compile_block(declaration.body, scope)
+    if not always_returns(declaration.body):
+        raise NotVectorizable("not every path returns a value")
+    if len(scope.returns) != 1:
+        raise NotVectorizable("returns values of different types")
+    zero = np.zeros if NUM in scope.returns else _falses
+
+    def kernel(*arrays):
+        shape = np.broadcast_shapes(*(a.shape for a in arrays)) if arrays else ()
+        active = np.ones(shape, dtype=bool)
+        result = zero(shape)
+        result, _ = body(arrays, active, result)
+        return result
+
+    return kernel
+
+
+def _falses(shape) -> Any:
+    return np.zeros(shape, dtype=bool)
+
+
+def always_returns(statements: list[Stmt]) -> bool:
+    for stmt in statements:
+        if isinstance(stmt, Return):
+            return True
+        if isinstance(stmt, Block) and always_returns(stmt.statements):
+            return True
+        if (
+            isinstance(stmt, If)
+            and stmt.else_branch is not None
+            and always_returns([stmt.then_branch])
+            and always_returns([stmt.else_branch])
+        ):
+            return True
+    return False
+
+
+def compile_block(statements: list[Stmt], scope: Scope) -> Callable:
+    steps = [compile_stmt(stmt, scope) for stmt in statements]
+
+    def run(arrays, active, result):
+        for step in steps:
+            if not active.any():
+                break
+            result, active = step(arrays, active, result)
+        return result, active
+
+    return run
+
+
+# Statements take the rows that are still running (``active``) and return
+# the updated result together with the rows that have not returned yet.
+@singledispatch
+def compile_stmt(stmt: Stmt, scope: Scope) -> Callable:
+    raise NotVectorizable(f"unsupported statement {stmt.__class__.__name__}")
+
+
+@compile_stmt.register
+def _(stmt: Block, scope: Scope) -> Callable:
+    return compile_block(stmt.statements, scope)
+
+
+@compile_stmt.register
+def _(stmt: Return, scope: Scope) -> Callable:
+    if stmt.value is None:
+        raise NotVectorizable("returns nil")
+    column = compile_expr(stmt.value, scope)
+    scope.returns.add(column.type)
+
+    def run(arrays, active, result):
+        result = np.where(active, column.value(arrays), result)
+        return result, np.zeros_like(active)
+
+    return run
+
+
+@compile_stmt.register
+def _(stmt: If, scope: Scope) -> Callable:
+    condition = truthy(compile_expr(stmt.condition, scope))
+    then_branch = compile_stmt(stmt.then_branch, scope)
+    else_branch = None
+    if stmt.else_branch is not None:
+        else_branch = compile_stmt(stmt.else_branch, scope)
+
+    def run(arrays, active, result):
+        mask = condition(arrays)
+        result, then_active = then_branch(arrays, active & mask, result)
+        else_active = active & ~mask
+        if else_branch is not None:
+            result, else_active = else_branch(arrays, else_active, result)
+        return result, then_active | else_active
+
+    return run
+
+
+def truthy(column: Column) -> Callable:
+    if column.type == NUM:
+        return lambda arrays: np.ones(np.shape(column.value(arrays)), dtype=bool)
+    return column.value
+
+
+@singledispatch
+def compile_expr(expr: Expr, scope: Scope) -> Column:
+    raise NotVectorizable(f"unsupported expression {expr.__class__.__name__}")
+
+
+@compile_expr.register
+def _(expr: Literal, scope: Scope) -> Column:
+    value = expr.value
+    if isinstance(value, bool):
+        return Column(BOOL, lambda arrays: np.bool_(value))
+    if isinstance(value, float):
+        return Column(NUM, lambda arrays: np.float64(value))
+    raise NotVectorizable(f"unsupported literal {value!r}")
+
+
+@compile_expr.register
+def _(expr: Variable, scope: Scope) -> Column:
+    name = expr.name.lexeme
+    if name not in scope.params:
+        raise NotVectorizable(f"reads non-parameter '{name}'")
+    index = scope.params[name]
+    return Column(NUM, lambda arrays: arrays[index])
+
+
+@compile_expr.register
+def _(expr: Grouping, scope: Scope) -> Column:
+    return compile_expr(expr.expression, scope)
+
+
+@compile_expr.register
+def _(expr: Unary, scope: Scope) -> Column:
+    right = compile_expr(expr.right, scope)
+    match expr.operator.type:
+        case "MINUS":
+            require_numbers(right)
+            return Column(NUM, lambda arrays: -right.value(arrays))
+        case "BANG":
+            condition = truthy(right)
+            return Column(BOOL, lambda arrays: ~condition(arrays))
+        case op:
+            raise NotVectorizable(f"unsupported operator {op}")
+
+
+ARITHMETIC = {
+    "PLUS": lambda left, right: left + right,
+    "MINUS": lambda left, right: left - right,
+    "STAR": lambda left, right: left * right,
+    "SLASH": lambda left, right: divide(left, right),
+}
+
+COMPARISON = {
+    "GREATER": lambda left, right: left > right,
+    "GREATER_EQUAL": lambda left, right: left >= right,
+    "LESS": lambda left, right: left < right,
+    "LESS_EQUAL": lambda left, right: left <= right,
+}
+
+
+def divide(left, right):
+    # Same results as interpreter.divide, including the sign of 0/0 and -0.0.
+    quotient = left / np.where(right != 0, right, 1.0)
+    signed = np.where(left == 0, np.nan, np.where(left > 0, np.inf, -np.inf))
+    return np.where(right != 0, quotient, signed)
+
+
+@compile_expr.register
+def _(expr: Binary, scope: Scope) -> Column:
+    left = compile_expr(expr.left, scope)
+    right = compile_expr(expr.right, scope)
+    op = expr.operator.type
+    if op in ARITHMETIC or op in COMPARISON:
+        require_numbers(left, right)
+        fn = ARITHMETIC.get(op) or COMPARISON[op]
+        kind = NUM if op in ARITHMETIC else BOOL
+        return Column(kind, lambda arrays: fn(left.value(arrays), right.value(arrays)))
+    if op in ("EQUAL_EQUAL", "BANG_EQUAL"):
+        negate = op == "BANG_EQUAL"
+        if left.type != right.type:
+            return Column(BOOL, lambda arrays: np.bool_(negate))
+        if negate:
+            return Column(BOOL, lambda arrays: left.value(arrays) != right.value(arrays))
+        return Column(BOOL, lambda arrays: left.value(arrays) == right.value(arrays))
+    raise NotVectorizable(f"unsupported operator {op}")
+
+
+@compile_expr.register
+def _(expr: Logical, scope: Scope) -> Column:
+    left = compile_expr(expr.left, scope)
+    right = compile_expr(expr.right, scope)
+    is_or = expr.operator.type == "OR"
+    if left.type == NUM:
+        # Numbers are always truthy: 'or' keeps the left side, 'and' the right.
+        return left if is_or else right
+    if right.type != BOOL:
+        raise NotVectorizable("logical operator mixes booleans and numbers")
+    if is_or:
+        return Column(BOOL, lambda arrays: left.value(arrays) | right.value(arrays))
+    return Column(BOOL, lambda arrays: left.value(arrays) & right.value(arrays))
+
+
+def require_numbers(*columns: Column) -> None:
+    if any(column.type != NUM for column in columns):
+        raise NotVectorizable("arithmetic on non-number operands")
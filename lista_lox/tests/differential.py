@@ -0,0 +1,121 @@
+"""Differential harness: run every example on every registered engine.
+
+Each program's output is compared across engines and against its
+``// expect:`` comments, and the time each engine took is reported.
+Programs under examples/benchmark print timings, so only their speed is
+compared.
+
+    python tests/differential.py [--engine NAME ...] [--only SECTION ...]
+"""
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from conftest import compare_output, from_runner, parse_expects
+from lox.__main__ import Lox
+from lox.engines import ENGINES
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+SPEED_ONLY = {"benchmark"}
+
+
+@dataclass
+class Outcome:
+    output: str
+    seconds: float
+    error: Exception | None = None
+
+
+@dataclass
+class Report:
+    path: Path
+    outcomes: dict[str, Outcome] = field(default_factory=dict)
+    expected_ok: dict[str, bool] = field(default_factory=dict)
+
+    @property
+    def speed_only(self) -> bool:
+        return self.path.relative_to(EXAMPLES).parts[0] in SPEED_ONLY
+
+    @property
+    def agree(self) -> bool:
+        if self.speed_only:
+            return True
+        outputs = {outcome.output for outcome in self.outcomes.values()}
+        return len(outputs) == 1
+
+
+def run_engine(engine: str, source: str) -> Outcome:
+    lox = Lox(engine=engine)
+    start = time.perf_counter()
+    output, error = from_runner(source, lox.run)
+    return Outcome(output, time.perf_counter() - start, error)
+
+
+def matches_expected(output: str, expected: str) -> bool:
+    try:
+        compare_output(output, expected)
+    except AssertionError:
+        return False
+    return True
+
+
+def check_file(path: Path, engines: list[str]) -> Report:
+    source = path.read_text(encoding="utf-8")
+    expected = parse_expects(source)
+    report = Report(path)
+    for engine in engines:
+        outcome = run_engine(engine, source)
+        report.outcomes[engine] = outcome
+        report.expected_ok[engine] = outcome.error is None and matches_expected(
+            outcome.output, expected
+        )
+    return report
+
+
+def example_files(sections: list[str] | None = None) -> list[Path]:
+    paths = sorted(EXAMPLES.rglob("*.lox"))
+    if sections:
+        paths = [p for p in paths if p.relative_to(EXAMPLES).parts[0] in sections]
+    return paths
+
+
+def run_harness(engines: list[str], sections: list[str] | None = None) -> list[Report]:
+    return [check_file(path, engines) for path in example_files(sections)]
+
+
+def print_report(reports: list[Report], engines: list[str]) -> None:
+    disagreements = [r for r in reports if not r.agree]
+    for report in disagreements:
+        print(f"DISAGREE {report.path.relative_to(EXAMPLES)}")
+        for engine, outcome in report.outcomes.items():
+            print(f"  {engine}: {outcome.output.splitlines()[:3]!r}")
+    checked = [r for r in reports if not r.speed_only]
+    print()
+    print(f"{'engine':<12}{'expected ok':>14}{'total (s)':>12}{'speedup':>10}")
+    baseline = sum(r.outcomes[engines[0]].seconds for r in reports)
+    for engine in engines:
+        passed = sum(r.expected_ok[engine] for r in checked)
+        total = sum(r.outcomes[engine].seconds for r in reports)
+        speedup = baseline / total if total else float("inf")
+        print(f"{engine:<12}{f'{passed}/{len(checked)}':>14}{total:>12.3f}{speedup:>9.2f}x")
+    print(f"\n{len(reports)} programs, {len(disagreements)} disagreements between engines")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", action="append", choices=sorted(ENGINES))
+    parser.add_argument("--only", action="append", help="example section to run")
+    args = parser.parse_args(argv)
+    engines = args.engine or list(ENGINES)
+    reports = run_harness(engines, args.only)
+    print_report(reports, engines)
+    return 1 if any(not r.agree for r in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
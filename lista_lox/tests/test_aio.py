@@ -0,0 +1,71 @@
+import asyncio
+import time
+import pytest
+from lox.__main__ import Lox
+
+SLEEPER = """
+fun nap(times) {
+    for (var i = 0; i < times; i = i + 1) sleep(0.05);
+    return times;
+}
+print name + " slept " + nap(2) + " times";
+"""
+
+
+def test_sleeping_scripts_share_the_event_loop():
+    async def main():
+        outputs = [[] for _ in range(100)]
+        runs = [
+            Lox(output=lines).run_async(f'var name = "s{i}";' + SLEEPER)
+            for i, lines in enumerate(outputs)
+        ]
+        start = time.perf_counter()
+        assert await asyncio.gather(*runs) == [""] * 100
+        return outputs, time.perf_counter() - start
+
+    outputs, seconds = asyncio.run(main())
+    assert outputs[7] == ["s7 slept 2 times"]
+    assert seconds < 1.5
+
+
+def test_loops_yield_to_other_tasks():
+    async def main():
+        lox = Lox()
+        busy = asyncio.create_task(lox.run_async("var i = 0; while (true) i = i + 1;"))
+        await asyncio.sleep(0.05)
+        lox.cancel()
+        return await busy
+
+    assert asyncio.run(main()) == "runtime error: Execution cancelled."
+
+
+def test_task_cancellation_releases_the_instance(capsys):
+    async def main():
+        lox = Lox()
+        task = asyncio.create_task(lox.run_async("while (true) sleep(1);"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await lox.run_async("print 1;")
+
+    assert asyncio.run(main()) == ""
+    assert capsys.readouterr().out == "1\n"
+
+
+def test_read_file(tmp_path, capsys):
+    (tmp_path / "data.txt").write_text("contents")
+    script = f'print readFile("{tmp_path / "data.txt"}") + "!";'
+    assert asyncio.run(Lox().run_async(script)) == ""
+    assert Lox().run(script) == ""
+    assert capsys.readouterr().out == "contents!\ncontents!\n"
+    missing = f'readFile("{tmp_path / "missing.txt"}");'
+    assert asyncio.run(Lox().run_async(missing)).startswith("runtime error: Could not read file")
+
+
+def test_errors_match_the_synchronous_interpreter():
+    script = 'fun f(a) { return a; } print f(1) + sleep(0);'
+    assert asyncio.run(Lox(output=[]).run_async(script)) == Lox(output=[]).run(script)
+    script = 'sleep(-1);'
+    expected = "runtime error: Argument to 'sleep' must be a non-negative number."
+    assert asyncio.run(Lox(output=[]).run_async(script)) == expected
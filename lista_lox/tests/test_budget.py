@@ -0,0 +1,36 @@
+import threading
+import time
+from lox.__main__ import Lox
+
+COUNT = """
+var i = 0;
+while (i < 10) i = i + 1;
+fun f() {}
+f(); f();
+print i;
+"""
+
+
+def test_fuel_counts_back_edges_and_calls(capsys):
+    assert Lox().run(COUNT, fuel=12) == ""
+    assert capsys.readouterr().out == "10\n"
+    assert Lox().run(COUNT, fuel=11) == "runtime error: Out of fuel."
+
+
+def test_timeout(capsys):
+    start = time.monotonic()
+    assert Lox().run("while (true) {}", timeout=0.2) == "runtime error: Timeout exceeded."
+    assert time.monotonic() - start < 5
+
+
+def test_cancel_from_another_thread(capsys):
+    lox = Lox()
+    result = []
+    worker = threading.Thread(target=lambda: result.append(lox.run("while (true) {}")))
+    worker.start()
+    time.sleep(0.1)
+    lox.cancel()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert result == ["runtime error: Execution cancelled."]
+    assert lox.run("print 1;") == ""
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from differential import EXAMPLES, example_files
+from lox.__main__ import Lox, main
+from lox.coverage import Coverage
+
+SOURCE = """\
+fun sign(n) {
+  if (n < 0) return -1;
+  if (n == 0 or n != n) return 0;
+  return 1;
+}
+var total = 0;
+for (var i = -2; i < 3; i = i + 1)
+  total = total + sign(i);
+print total;
+if (false) {
+  print "never";
+}
+"""
+
+
+def covered(source: str) -> Coverage:
+    coverage = Coverage()
+    assert Lox(output=[], coverage=coverage).run(source, "sign.lox") == ""
+    return coverage
+
+
+def test_line_hits():
+    report = covered(SOURCE).files()
+    (path, lines), = ((path, report.lines) for path, report in report.items())
+    assert path.endswith("sign.lox")
+    assert lines == {1: 1, 2: 5, 3: 3, 4: 2, 6: 1, 7: 5, 8: 5, 9: 1, 10: 1, 11: 0}
+
+
+def test_branch_hits():
+    report = next(iter(covered(SOURCE).files().values()))
+    assert report.branches == {
+        (2, 0, 0): 2, (2, 0, 1): 3,
+        (3, 1, 0): 1, (3, 1, 1): 2,
+        (3, 2, 0): 1, (3, 2, 1): 2,
+        (7, 3, 0): 5, (7, 3, 1): 1,
+        (10, 4, 0): 0, (10, 4, 1): 1,
+    }
+
+
+def test_branches_never_reached_are_marked():
+    coverage = covered("fun f(a) { if (a) print 1; }")
+    assert "BRDA:1,0,0,-\nBRDA:1,0,1,-\n" in coverage.lcov()
+
+
+def test_lcov_and_annotated_source(tmp_path, capsys):
+    script = tmp_path / "sign.lox"
+    script.write_text(SOURCE)
+    info, lines = tmp_path / "lcov.info", tmp_path / "lines.txt"
+    assert main([str(script), "--coverage", str(info), "--coverage-lines", str(lines)]) == 0
+    assert capsys.readouterr().out == "0\n"
+    records = info.read_text().splitlines()
+    assert records[:2] == ["TN:", f"SF:{script}"]
+    assert "DA:11,0" in records and "LF:10" in records and "LH:9" in records
+    assert "BRF:10" in records and "BRH:9" in records
+    assert records[-1] == "end_of_record"
+    annotated = lines.read_text().splitlines()
+    assert annotated[1] == "        5:    2:  if (n < 0) return -1;"
+    assert annotated[4] == "        -:    5:}"
+    assert annotated[10] == "    #####:   11:  print \"never\";"
+
+
+def test_runs_accumulate():
+    coverage = Coverage()
+    lox = Lox(output=[], coverage=coverage)
+    for _ in range(3):
+        assert lox.run(SOURCE, "sign.lox") == ""
+    assert next(iter(coverage.files().values())).lines[2] == 15
+
+
+def test_async_runs_are_counted():
+    coverage = Coverage()
+    lines = []
+    assert asyncio.run(Lox(output=lines, coverage=coverage).run_async(SOURCE)) == ""
+    assert lines == ["0"]
+    assert coverage.files()["<script>"].lines[8] == 5
+
+
+PROGRAMS = [p for p in example_files() if p.relative_to(EXAMPLES).parts[0] != "benchmark"]
+
+
+@pytest.mark.parametrize("path", PROGRAMS, ids=lambda p: str(p.relative_to(EXAMPLES)))
+def test_output_unchanged(path):
+    source = path.read_text(encoding="utf-8")
+    assert outcome(source, None) == outcome(source, Coverage())
+
+
+def outcome(source: str, coverage: Coverage | None) -> tuple[list[str], str]:
+    # A few examples still end in Python exceptions (top-level return, stack
+    # overflow); those must at least be the same ones.
+    lines = []
+    try:
+        Lox(output=lines, coverage=coverage).run(source)
+    except Exception as error:
+        return lines, type(error).__name__
+    return lines, ""
@@ -0,0 +1,17 @@
+import pytest
+from differential import EXAMPLES, check_file, example_files
+from lox.__main__ import Lox
+from lox.engines import ENGINES
+
+PROGRAMS = [p for p in example_files() if p.relative_to(EXAMPLES).parts[0] != "benchmark"]
+
+
+@pytest.mark.parametrize("path", PROGRAMS, ids=lambda p: str(p.relative_to(EXAMPLES)))
+def test_engines_agree(path):
+    report = check_file(path, list(ENGINES))
+    assert report.agree, {name: o.output for name, o in report.outcomes.items()}
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError, match="unknown engine"):
+        Lox(engine="missing")
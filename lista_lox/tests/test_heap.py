@@ -0,0 +1,41 @@
+import pytest
+from lox.__main__ import Lox
+
+PROGRAM = """
+class Node {}
+fun make() { return Node(); }
+var label = "";
+for (var i = 0; i < 10; i = i + 1) {
+  var node = make();
+  label = label + "x";
+}
+print label;
+"""
+
+
+def test_counters_available_after_run(capsys):
+    lox = Lox()
+    assert lox.run(PROGRAM) == ""
+    assert capsys.readouterr().out == "xxxxxxxxxx\n"
+    assert lox.heap.counts == {
+        "instances": 10,
+        "strings": 10,
+        "string_chars": 55,
+        "scopes": 12,
+        "functions": 1,
+    }
+
+
+@pytest.mark.parametrize("kind, limit", [("instances", 5), ("strings", 3), ("string_chars", 20), ("scopes", 4)])
+def test_quota_raises_runtime_error(capsys, kind, limit):
+    lox = Lox(heap_limits={kind: limit})
+    error = lox.run(PROGRAM)
+    assert error == f"runtime error: Heap quota exceeded: more than {limit} {kind}."
+    assert getattr(lox.heap, kind) == limit + 1
+
+
+def test_quota_is_per_run(capsys):
+    lox = Lox(heap_limits={"instances": 15})
+    assert lox.run(PROGRAM) == ""
+    assert lox.run(PROGRAM) == ""
+    assert lox.heap.instances == 10
@@ -0,0 +1,87 @@
+import pytest
+from differential import EXAMPLES, example_files
+from lox.__main__ import Lox
+from lox.parser import parse
+from lox.purity import analyze_purity
+from lox.scanner import tokenize
+
+FIB = (EXAMPLES / "benchmark" / "fib.lox").read_text(encoding="utf-8")
+
+
+def pure_functions(source: str) -> set[str]:
+    return analyze_purity(parse(tokenize(source)))
+
+
+def test_purity_analysis():
+    source = """
+    var limit = 10;
+    fun square(x) { return x * x; }
+    fun sum(n) { var total = 0; for (var i = 0; i < n; i = i + 1) total = total + square(i); return total; }
+    fun even(n) { if (n == 0) return true; return odd(n - 1); }
+    fun odd(n) { if (n == 0) return false; return even(n - 1); }
+    fun capped(n) { return n < limit; }
+    fun noisy(n) { print n; return n; }
+    fun calls_noisy(n) { return noisy(n) + 1; }
+    fun setter(n) { limit = n; }
+    fun timed() { return clock(); }
+    fun leaky(n) { { var inner = 1; } inner = n; }
+    fun closure(n) { fun inner() { return n; } return inner; }
+    fun redefined(n) { return n; }
+    var redefined = 1;
+    fun reassigned(n) { return n; }
+    reassigned = nil;
+    """
+    assert pure_functions(source) == {"square", "sum", "even", "odd"}
+
+
+def test_fib_output_is_unchanged():
+    plain, memoized = [], []
+    Lox(output=plain).run(FIB)
+    lox = Lox(output=memoized, memoize=True)
+    assert lox.run(FIB) == ""
+    assert plain[0] == memoized[0] == "true"
+    table, = lox.memo.tables.values()
+    assert (table.name, table.hits, table.misses, table.evictions) == ("fib", 33, 36, 0)
+    assert lox.memo.report() == "memo fib: 33 hits, 36 misses, 0 evictions, 0 uncached calls"
+
+
+def test_impure_functions_run_every_time():
+    lines = []
+    lox = Lox(output=lines, memoize=True)
+    lox.run("fun show(n) { print n; return n; } show(1); show(1);")
+    assert lines == ["1", "1"]
+    assert lox.memo.tables == {}
+
+
+def test_lru_bound():
+    lox = Lox(output=[], memoize=True, memo_size=2)
+    lox.run("fun f(n) { return n + 1; } f(1); f(2); f(3); f(1); f(3);")
+    table, = lox.memo.tables.values()
+    assert (table.hits, table.misses, table.evictions) == (1, 4, 2)
+
+
+def test_arguments_that_compare_unlike_lox_values_are_not_cached():
+    lines = []
+    lox = Lox(output=lines, memoize=True)
+    lox.run("fun inv(n) { return 1 / n; } print inv(0); print inv(-0); print inv(nil == nil);")
+    assert lines[:2] == ["inf", "-inf"]
+    table, = lox.memo.tables.values()
+    assert (table.misses, table.uncached) == (1, 2)
+
+
+PROGRAMS = [p for p in example_files() if p.relative_to(EXAMPLES).parts[0] != "benchmark"]
+
+
+@pytest.mark.parametrize("path", PROGRAMS, ids=lambda p: str(p.relative_to(EXAMPLES)))
+def test_output_unchanged(path):
+    source = path.read_text(encoding="utf-8")
+    assert outcome(source, False) == outcome(source, True)
+
+
+def outcome(source: str, memoize: bool) -> tuple[list[str], str]:
+    lines = []
+    try:
+        Lox(output=lines, memoize=memoize).run(source)
+    except Exception as error:
+        return lines, type(error).__name__
+    return lines, ""
@@ -0,0 +1,49 @@
+import os
+from lox.__main__ import Lox
+from lox.modules import MODULES
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def run(path, capsys):
+    error = Lox().run(path.read_text(encoding="utf-8"), str(path))
+    return capsys.readouterr().out, error
+
+
+def test_import_runs_module_once_relative_to_importer(tmp_path, capsys):
+    write(tmp_path / "lib" / "math.lox", 'import "helpers.lox";\nfun twice(x) { return x * 2; }\n')
+    write(tmp_path / "lib" / "helpers.lox", 'print "helpers";\nvar base = 20;\n')
+    main = write(tmp_path / "main.lox", 'import "lib/math.lox";\nimport "lib/helpers.lox";\nprint twice(base + 1);\n')
+    assert run(main, capsys) == ("helpers\n42\n", "")
+
+
+def test_modules_are_parsed_once_per_process(tmp_path, capsys):
+    write(tmp_path / "lib.lox", "fun one() { return 1; }\n")
+    main = write(tmp_path / "main.lox", 'import "lib.lox";\nprint one();\n')
+    run(main, capsys)
+    loads = MODULES.loads
+    assert run(main, capsys) == ("1\n", "")
+    assert MODULES.loads == loads
+
+    lib = write(tmp_path / "lib.lox", "fun one() { return 11; }\n")
+    stat = os.stat(lib)
+    os.utime(lib, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert run(main, capsys) == ("11\n", "")
+    assert MODULES.loads == loads + 1
+
+
+def test_import_cycle_is_reported(tmp_path, capsys):
+    write(tmp_path / "b.lox", 'import "a.lox";\n')
+    main = write(tmp_path / "a.lox", 'import "b.lox";\n')
+    _, error = run(main, capsys)
+    assert error == '[line 1] Error at "a.lox": Import cycle a.lox -> b.lox -> a.lox.'
+
+
+def test_missing_module(tmp_path, capsys):
+    main = write(tmp_path / "main.lox", 'import "missing.lox";\n')
+    _, error = run(main, capsys)
+    assert error == '[line 1] Error at "missing.lox": Module not found.'
@@ -0,0 +1,47 @@
+import io
+from contextlib import redirect_stdout
+from lox.__main__ import Lox
+from lox.output import StreamOutput
+
+PROGRAM = """
+print 1;
+print -0;
+print 2.5;
+print 1000000000000000000000;
+print "a" + 1;
+print nil;
+print true;
+print 1 / 0;
+print undefined;
+"""
+
+EXPECTED = ["1", "-0", "2.5", "1e+21", "a1", "nil", "true", "inf", "runtime error: Undefined variable 'undefined'."]
+
+
+def test_list_sink():
+    lines = []
+    Lox(output=lines).run(PROGRAM)
+    assert lines == EXPECTED
+
+
+def test_callback_sink():
+    lines = []
+    Lox(output=lines.append).run(PROGRAM)
+    assert lines == EXPECTED
+
+
+def test_file_sink_matches_stdout():
+    stream = io.StringIO()
+    Lox(output=stream).run(PROGRAM)
+    with redirect_stdout(io.StringIO()) as stdout:
+        Lox().run(PROGRAM)
+    assert stream.getvalue() == stdout.getvalue() == "\n".join(EXPECTED) + "\n"
+
+
+def test_buffer_flushes_when_full():
+    stream = io.StringIO()
+    output = StreamOutput(stream, buffer_size=8)
+    output.write_line("1234")
+    assert stream.getvalue() == ""
+    output.write_line("5678")
+    assert stream.getvalue() == "1234\n5678\n"
@@ -0,0 +1,44 @@
+import pytest
+from lox.errors import LoxStaticError
+from lox.parallel_parse import parse_parallel, split_points
+from lox.parser import parse
+from lox.scanner import tokenize
+
+DECLARATIONS = """
+var a{i} = {i};
+fun f{i}(x) {{ if (x > {i}) return x; return a{i}; }}
+class C{i} {{ m(y) {{ for (var j = 0; j < y; j = j + 1) print j; }} }}
+"""
+
+BROKEN = """
+var b{i} = ;
+fun g{i}(x) {{ print x }}
+var ok{i} = # 1;
+"""
+
+
+def generate(template: str, count: int) -> str:
+    return "".join(template.format(i=i) for i in range(count))
+
+
+def outcome(parser, tokens):
+    try:
+        return parser(tokens).statements
+    except LoxStaticError as error:
+        return [str(e) for e in error.errors]
+
+
+def test_split_points_only_at_top_level():
+    tokens = tokenize("var a = 1; fun f() { var b; } for (var i = 0;;) {} class C {}")
+    assert [tokens[i].lexeme for i in split_points(tokens)] == ["var", "fun", "class"]
+
+
+@pytest.mark.parametrize("source", [
+    generate(DECLARATIONS, 40),
+    generate(DECLARATIONS, 20) + generate(BROKEN, 20) + "var tail = 1",
+])
+def test_parallel_parse_matches_serial(source):
+    tokens = tokenize(source)
+    serial = outcome(parse, tokens)
+    parallel = outcome(lambda t: parse_parallel(t, workers=2, min_tokens=0), tokens)
+    assert parallel == serial
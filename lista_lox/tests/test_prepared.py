@@ -0,0 +1,38 @@
+import pytest
+from lox.__main__ import Lox
+from lox.errors import LoxStaticError
+from lox.prepared import new_env
+
+SCRIPT = """
+fun score(x) { return x * factor; }
+print score(input);
+var seen = input;
+"""
+
+
+def test_run_many_times_with_bindings():
+    prepared = Lox().prepare(SCRIPT)
+    results = [prepared.run({"input": n, "factor": 2}) for n in range(3)]
+    assert [r.output for r in results] == [["0"], ["2"], ["4"]]
+    assert all(r.ok and r.seconds >= 0 for r in results)
+
+
+def test_runtime_errors_are_structured():
+    result = Lox().prepare(SCRIPT).run({"input": 1})
+    assert result.output == []
+    assert str(result.error) == "Undefined variable 'factor'."
+    assert result.error.token.line == 2
+
+
+def test_fresh_and_shared_environments():
+    prepared = Lox().prepare("print seen; seen = seen + 1;")
+    assert not prepared.run().ok
+    env = new_env()
+    env["seen"] = 1.0
+    assert prepared.run(env=env).output == ["1"]
+    assert prepared.run(env=env).output == ["2"]
+
+
+def test_static_errors_raise_on_prepare():
+    with pytest.raises(LoxStaticError):
+        Lox().prepare("print ;")
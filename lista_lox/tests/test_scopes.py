@@ -0,0 +1,27 @@
+from lox.ast import Block, While
+from lox.parser import parse
+from lox.scanner import tokenize
+from lox.scopes import analyze_scopes
+
+
+def analyzed(source: str):
+    program = parse(tokenize(source))
+    analyze_scopes(program)
+    return program.statements
+
+
+def test_loop_scopes_without_closures_are_reused():
+    [loop] = analyzed("for (var i = 0; i < 3; i = i + 1) { var j = i; print j; }")
+    assert loop.scope == "reuse"
+    body = loop.statements[1].body
+    assert isinstance(body, Block) and body.scope == "none"
+    assert body.statements[0].scope == "reuse"
+
+
+def test_blocks_around_closures_get_fresh_scopes():
+    [outer] = analyzed("{ var a = 1; while (true) { { fun f() { print a; } } } }")
+    assert outer.scope == "fresh"
+    loop = outer.statements[1]
+    assert isinstance(loop, While)
+    assert loop.body.scope == "none"
+    assert loop.body.statements[0].scope == "fresh"
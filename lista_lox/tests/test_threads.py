@@ -0,0 +1,99 @@
+import copy
+import pkgutil
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import lox
+from differential import EXAMPLES, example_files
+from lox.__main__ import Lox
+
+PROGRAMS = [
+    p.read_text(encoding="utf-8")
+    for p in example_files()
+    if p.relative_to(EXAMPLES).parts[0] != "benchmark"
+]
+
+
+def run(source: str) -> tuple[list[str], str]:
+    lines = []
+    try:
+        error = Lox(output=lines).run(source)
+    except Exception as e:
+        # Some examples still crash the interpreter (e.g. stack overflow);
+        # they must crash the same way in every thread.
+        error = repr(e)
+    return lines, error
+
+
+def module_state() -> dict[str, object]:
+    """Copies of every module-level dict, list and set in the lox package"""
+    state = {}
+    for info in pkgutil.iter_modules(lox.__path__, "lox."):
+        try:
+            module = importlib.import_module(info.name)
+        except Exception:
+            continue  # leftovers such as lox.exec do not import
+        for name, value in vars(module).items():
+            if type(value) in (dict, list, set) and not name.startswith("__"):
+                state[f"{info.name}.{name}"] = copy.deepcopy(value)
+    return state
+
+
+def test_examples_run_concurrently_like_serially():
+    serial = [run(source) for source in PROGRAMS]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        concurrent = list(executor.map(run, PROGRAMS * 2))
+    assert concurrent == serial * 2
+
+
+def test_runs_leave_module_state_untouched():
+    before = module_state()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(run, PROGRAMS))
+    assert module_state() == before
+
+
+def test_globals_are_per_instance():
+    a, b = Lox(output=[]), Lox(output=[])
+    a.run("var shared = 1;")
+    assert b.run("print shared;") == "runtime error: Undefined variable 'shared'."
+
+
+def test_prepared_program_runs_concurrently():
+    prepared = Lox().prepare("var total = 0; for (var i = 0; i < n; i = i + 1) total = total + i; print total;")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda n: prepared.run({"n": n}), range(50)))
+    assert [r.output for r in results] == [[str(n * (n - 1) // 2)] for n in range(50)]
+
+
+def test_limits_and_cancel_are_per_instance():
+    looping, counting = Lox(output=[]), Lox(output=[])
+    results = {}
+
+    def loop():
+        results["loop"] = looping.run("while (true) {}")
+
+    def count():
+        results["count"] = counting.run("var i = 0; while (i < 2000) i = i + 1;", fuel=5000)
+
+    threads = [threading.Thread(target=loop), threading.Thread(target=count)]
+    for thread in threads:
+        thread.start()
+    threads[1].join(timeout=10)
+    looping.cancel()
+    threads[0].join(timeout=10)
+    assert results == {"loop": "runtime error: Execution cancelled.", "count": ""}
+
+
+def test_one_program_at_a_time_per_instance():
+    lox = Lox(output=[])
+    worker = threading.Thread(target=lambda: lox.run("while (true) {}"))
+    worker.start()
+    while not lox.running.locked():
+        time.sleep(0.01)
+    with pytest.raises(RuntimeError, match="already running"):
+        lox.run("print 1;")
+    lox.cancel()
+    worker.join(timeout=10)
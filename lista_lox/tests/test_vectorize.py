@@ -0,0 +1,62 @@
+import math
+import pytest
+from lox.__main__ import Lox
+
+np = pytest.importorskip("numpy")
+
+SOURCE = """
+fun score(a, b) {
+  if (a > b and !(b == 0)) return (a - b) / b;
+  if (a < 0 or b < 0) return -a * 2;
+  return a / b;
+}
+
+fun positive(a) {
+  return a > 0 or a == -1;
+}
+
+fun greeting(a) {
+  return "hello";
+}
+
+fun maybe(a) {
+  if (a > 0) return a;
+}
+"""
+
+A = [3.0, 0.0, -2.0, 5.0, 0.0, -1.0, 1.5, 4.0]
+B = [1.0, 0.0, 4.0, 0.0, 2.0, -3.0, 0.0, -0.0]
+
+
+def same(actual, expected):
+    if isinstance(expected, float) and math.isnan(expected):
+        return math.isnan(actual)
+    return actual == expected and type(actual) is type(expected)
+
+
+def scalar_results(lox, name, *columns):
+    function = lox.env[name]
+    return [function.call(None, list(row)) for row in zip(*columns)]
+
+
+@pytest.fixture
+def lox():
+    lox = Lox()
+    lox.run(SOURCE)
+    return lox
+
+
+@pytest.mark.parametrize("name, columns", [("score", (A, B)), ("positive", (A,))])
+def test_vectorized_matches_interpreter(lox, name, columns):
+    vectorized = lox.vectorize(name)
+    assert vectorized.compiled
+    result = vectorized(*[np.array(column) for column in columns])
+    expected = scalar_results(lox, name, *columns)
+    assert all(same(a.item(), e) for a, e in zip(result, expected))
+
+
+@pytest.mark.parametrize("name", ["greeting", "maybe"])
+def test_unsupported_functions_fall_back(lox, name):
+    vectorized = lox.vectorize(name)
+    assert not vectorized.compiled
+    assert vectorized(A) == scalar_results(lox, name, A)